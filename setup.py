@@ -36,6 +36,12 @@ setup(
         'werkzeug>=2.0.0',
     ],
     extras_require={
+        'fast': [
+            'orjson>=3.6.0',
+        ],
+        'gitignore': [
+            'pathspec>=0.9.0',
+        ],
         'dev': [
             'pytest>=7.0.0',
             'pytest-flask>=1.2.0',
@@ -12,6 +12,7 @@ import pygments
 from pygments.lexers import get_lexer_for_filename, guess_lexer
 from pygments.formatters import HtmlFormatter
 from pygments.util import ClassNotFound
+from .paths import resolve_path
 
 # Setup logging
 logger = logging.getLogger("file_preview")
@@ -43,10 +44,10 @@ def preview_file(path):
         abort(500, description="Application base directory not configured.")
         
     # Convert the path to absolute path relative to configured BASE_DIR
-    abs_path = os.path.abspath(os.path.join(base_dir, path))
+    abs_path = resolve_path(base_dir, path)
     
     # Security check to prevent directory traversal attacks
-    if not abs_path.startswith(os.path.abspath(base_dir)):
+    if abs_path is None:
         abort(403)  # Forbidden
     
     # Check if path is a file
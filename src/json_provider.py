@@ -0,0 +1,27 @@
+"""
+JSON provider backed by orjson, used for API responses when orjson is installed.
+Output matches Flask's default provider: sorted keys, HTTP dates for datetimes.
+"""
+try:
+    import orjson
+    from flask.json.provider import DefaultJSONProvider
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    class OrjsonProvider(DefaultJSONProvider):
+        """Serialize with orjson, falling back to Flask's default() for other types"""
+        
+        # Datetimes go through default() so they keep Flask's HTTP date format
+        OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        
+        def dumps(self, obj, **kwargs):
+            option = self.OPTIONS
+            if kwargs.get('indent'):
+                option |= orjson.OPT_INDENT_2
+            return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+        
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+else:
+    OrjsonProvider = None
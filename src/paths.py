@@ -0,0 +1,22 @@
+"""
+Path helpers shared by the explorer routes.
+Keeps requested paths inside the configured base directory.
+"""
+import os
+from functools import lru_cache
+
+@lru_cache(maxsize=8)
+def base_prefix(base_dir):
+    """Return the absolute base directory with a trailing separator, computed once per base"""
+    return os.path.join(os.path.abspath(base_dir), '')
+
+def resolve_path(base_dir, rel_path):
+    """
+    Resolve a path relative to the base directory.
+    Returns the absolute path, or None if it points outside the base directory.
+    """
+    abs_path = os.path.abspath(os.path.join(base_dir, rel_path))
+    # The separator keeps /base-other from passing as a child of /base
+    if not (abs_path + os.sep).startswith(base_prefix(base_dir)):
+        return None
+    return abs_path
@@ -10,7 +10,7 @@ import sys
 import traceback
 from collections import defaultdict
 from pydantic import ValidationError
-from .models import PluginManifest
+from .models import load_manifest
 
 # Import the plugin base classes
 try:
@@ -35,6 +35,7 @@ class PluginManager:
         self.plugin_dir = plugin_dir
         self.plugins = {}  # UI plugins
         self.toolbar_items = []
+        self.page_mode_plugins = {}  # V2 UI plugins with a page mode, by ID
         
         # Initialize backend plugin system if available
         if BACKEND_PLUGINS_ENABLED:
@@ -98,12 +99,9 @@ class PluginManager:
                 
             try:
                 logger.debug(f"Loading manifest from {manifest_path}")
-                with open(manifest_path, 'r') as f:
-                    manifest_data = json.load(f)
-
-                # Validate using Pydantic
+                # Validated with Pydantic unless unchanged since it last passed
                 try:
-                    manifest_model = PluginManifest.model_validate(manifest_data)
+                    manifest_model = load_manifest(manifest_path)
                 except ValidationError as exc:
                     logger.error(f"Invalid manifest.json in {plugin_path}: {exc}")
                     continue
@@ -207,6 +205,12 @@ class PluginManager:
                 "page_title": manifest.get("page_title")
             })
             
+            # Index page-mode plugins once; plugin_page looks them up on every request
+            if (manifest.get('schema_version') == '2.0' and
+                manifest.get('supports_page_mode', False) and
+                manifest.get('type') == 'ui'):
+                self.page_mode_plugins[manifest["id"]] = self.plugins[manifest["id"]]
+            
             logger.info(f"Successfully loaded UI plugin: {manifest['name']}")
         except Exception as e:
             logger.error(f"Failed to load UI plugin '{plugin_name}' from {plugin_path}: {e}")
@@ -377,15 +381,8 @@ class PluginManager:
         return self.toolbar_items
     
     def get_page_mode_plugins(self):
-        """Get plugins that support page mode (V2 only)"""
-        page_plugins = {}
-        for plugin_id, plugin in self.plugins.items():
-            manifest = plugin['manifest']
-            if (manifest.get('schema_version') == '2.0' and 
-                manifest.get('supports_page_mode', False) and
-                manifest.get('type') == 'ui'):
-                page_plugins[plugin_id] = plugin
-        return page_plugins
+        """Get plugins that support page mode (V2 only), as indexed when they were loaded"""
+        return self.page_mode_plugins
     
     def get_plugin_manifest(self, plugin_id):
         """Get manifest for a specific plugin"""
@@ -9,9 +9,7 @@ import sys
 import os
 from typing import List, Tuple, Dict, Any
 
-# Setup logging with more detailed format
-logging.basicConfig(level=logging.DEBUG, 
-                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+# Logging is configured by the application; this module only emits records
 logger = logging.getLogger("dependency_manager")
 
 class DependencyManager:
@@ -29,14 +27,16 @@ class DependencyManager:
         
         if os.path.exists(docker_path) and os.access(docker_path, os.W_OK):
             self.requirements_file = docker_path
-            logger.debug(f"Using Docker container requirements file path: {self.requirements_file}")
+            logger.debug("Using Docker container requirements file path: %s", self.requirements_file)
         else:
             self.requirements_file = local_path
-            logger.debug(f"Using local requirements file path: {self.requirements_file}")
-            
-        logger.debug(f"Requirements file path: {self.requirements_file}")
+            logger.debug("Using local requirements file path: %s", self.requirements_file)
+
+        # pip output of the latest install is written here rather than kept in memory
+        self.pip_log_file = os.path.join(os.path.dirname(self.requirements_file), "pip_install.log")
+        
         self._refresh_installed_packages()
-        logger.debug(f"Initial packages detected: {len(self.installed_packages)}")
+        logger.debug("Initial packages detected: %d", len(self.installed_packages))
     
     def _refresh_installed_packages(self):
         """Refresh the list of installed packages"""
@@ -46,7 +46,7 @@ class DependencyManager:
                 pkg.key: pkg.version 
                 for pkg in pkg_resources.working_set
             }
-            logger.debug(f"Found {len(self.installed_packages)} installed packages")
+            logger.debug("Found %d installed packages", len(self.installed_packages))
         except Exception as e:
             logger.error(f"Error refreshing installed packages: {e}", exc_info=True)
     
@@ -55,34 +55,21 @@ class DependencyManager:
         Parse a requirement string into name and version specifier
         Example: "pydantic>=2.0.0" -> ("pydantic", ">=2.0.0")
         """
-        logger.debug(f"Parsing requirement: {requirement_str}")
         req = pkg_resources.Requirement.parse(requirement_str)
-        result = (req.name, str(req.specifier) if req.specifier else None)
-        logger.debug(f"Parsed as: {result}")
-        return result
+        return (req.name, str(req.specifier) if req.specifier else None)
     
     def _is_satisfied(self, package_name, version_spec=None):
         """Check if a package requirement is satisfied"""
-        logger.debug(f"Checking if requirement satisfied: {package_name}{version_spec or ''}")
-        
-        if package_name.lower() not in self.installed_packages:
-            logger.debug(f"Package {package_name} not installed")
+        installed_version = self.installed_packages.get(package_name.lower())
+        if installed_version is None:
             return False
             
         if not version_spec:
-            logger.debug(f"Package {package_name} installed, no version constraint")
             return True
             
         try:
-            installed_version = self.installed_packages[package_name.lower()]
-            logger.debug(f"Package {package_name} installed version: {installed_version}")
-            
-            requirement = f"{package_name}{version_spec}"
-            req = pkg_resources.Requirement.parse(requirement)
-            
-            result = pkg_resources.parse_version(installed_version) in req
-            logger.debug(f"Version check result: {result} (required: {version_spec}, installed: {installed_version})")
-            return result
+            req = pkg_resources.Requirement.parse(f"{package_name}{version_spec}")
+            return pkg_resources.parse_version(installed_version) in req
         except Exception as e:
             logger.error(f"Error checking version requirement: {e}", exc_info=True)
             return False
@@ -92,7 +79,7 @@ class DependencyManager:
         Check if dependencies are satisfied
         Returns: (is_satisfied, missing_deps)
         """
-        logger.debug(f"Checking dependencies for plugin {plugin_id}: {dependencies}")
+        logger.debug("Checking dependencies for plugin %s: %s", plugin_id, dependencies)
         
         # Add all dependencies to the tracking set
         for dep in dependencies:
@@ -101,31 +88,37 @@ class DependencyManager:
         # Try to update requirements file, but don't fail if we can't
         self._update_requirements_file(fail_silently=True)
             
+        satisfied, missing = self.verify(dependencies)
+        if missing:
+            logger.debug("Missing dependencies for plugin %s: %s", plugin_id, missing)
+        return satisfied, missing
+    
+    def verify(self, dependencies):
+        """
+        Check dependencies against the installed packages without touching
+        the requirements file
+        Returns: (is_satisfied, missing_deps)
+        """
         missing = []
         for dep in dependencies:
             try:
-                # Parse requirement
                 req_name, req_spec = self._parse_requirement(dep)
-                satisfied = self._is_satisfied(req_name, req_spec)
-                logger.debug(f"Dependency check for {dep}: {'Satisfied' if satisfied else 'Missing'}")
-                if not satisfied:
+                if not self._is_satisfied(req_name, req_spec):
                     missing.append(dep)
             except Exception as e:
                 logger.error(f"Error parsing dependency '{dep}': {e}", exc_info=True)
                 missing.append(dep)
-        
-        logger.debug(f"Dependencies check result - All satisfied: {len(missing) == 0}, Missing: {missing}")        
         return len(missing) == 0, missing
     
     def _update_requirements_file(self, fail_silently=False):
         """Write all plugin dependencies to requirements.txt file"""
         try:
-            logger.debug(f"Writing {len(self.all_plugin_dependencies)} dependencies to {self.requirements_file}")
+            logger.debug("Writing %d dependencies to %s", len(self.all_plugin_dependencies), self.requirements_file)
             
             # Check if the file is writable before attempting to write
             if not os.path.exists(os.path.dirname(self.requirements_file)):
                 os.makedirs(os.path.dirname(self.requirements_file), exist_ok=True)
-                logger.debug(f"Created directory: {os.path.dirname(self.requirements_file)}")
+                logger.debug("Created directory: %s", os.path.dirname(self.requirements_file))
                 
             if os.path.exists(self.requirements_file) and not os.access(self.requirements_file, os.W_OK):
                 if not fail_silently:
@@ -159,12 +152,22 @@ class DependencyManager:
                 logger.error(f"Error writing requirements file: {e}", exc_info=True)
                 return False
     
+    def _read_log_tail(self, max_bytes=4096):
+        """Return the last max_bytes of the latest pip output"""
+        try:
+            with open(self.pip_log_file, 'rb') as log:
+                end = log.seek(0, os.SEEK_END)
+                log.seek(max(0, end - max_bytes))
+                return log.read().decode('utf-8', errors='replace')
+        except OSError as e:
+            return f"(could not read {self.pip_log_file}: {e})"
+    
     def install_dependencies(self, plugin_id, dependencies):
         """
         Install dependencies for a plugin
         Returns: (success, error_message)
         """
-        logger.debug(f"Installing dependencies for plugin {plugin_id}: {dependencies}")
+        logger.debug("Installing dependencies for plugin %s: %s", plugin_id, dependencies)
         
         # Add all dependencies to the tracking set
         for dep in dependencies:
@@ -173,11 +176,6 @@ class DependencyManager:
         # Try to update requirements file, but don't fail if we can't
         self._update_requirements_file(fail_silently=True)
         
-        # Log Python executable and environment
-        logger.debug(f"Python executable: {sys.executable}")
-        logger.debug(f"Python version: {sys.version}")
-        logger.debug(f"Platform: {sys.platform}")
-        
         try:
             if not dependencies:
                 logger.debug("No dependencies to install")
@@ -187,41 +185,31 @@ class DependencyManager:
             
             # Use pip to install dependencies
             cmd = [sys.executable, "-m", "pip", "install"] + dependencies
-            logger.debug(f"Running command: {' '.join(cmd)}")
-            
-            # Capture output for debugging
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            stdout, stderr = process.communicate()
-            
-            if process.returncode != 0:
-                logger.error(f"Pip install failed (exit code {process.returncode})")
-                logger.debug(f"Pip output (stdout): {stdout}")
-                logger.debug(f"Pip error (stderr): {stderr}")
-                return False, f"Pip install failed: {stderr}"
+            logger.debug("Running command: %s", cmd)
+            
+            # Send pip output straight to the log file instead of buffering it;
+            # each install replaces the previous log so it cannot grow unbounded
+            with open(self.pip_log_file, 'wb') as log:
+                result = subprocess.run(
+                    cmd,
+                    stdout=log,
+                    stderr=subprocess.STDOUT,
+                    check=False
+                )
+            
+            if result.returncode != 0:
+                logger.error(f"Pip install failed (exit code {result.returncode}), see {self.pip_log_file}")
+                return False, f"Pip install failed: {self._read_log_tail()}"
                 
-            logger.debug(f"Pip install succeeded. Output: {stdout}")
+            logger.debug("Pip install succeeded, output written to %s", self.pip_log_file)
             
-            # Refresh installed packages
+            # Refresh installed packages; pip's exit code is trusted, callers
+            # that need a post-install check can use verify()
             logger.debug("Refreshing package list after installation")
             self._refresh_installed_packages()
             
-            # Verify dependencies were actually installed
-            all_satisfied, still_missing = self.check_dependencies(plugin_id, dependencies)
-            if not all_satisfied:
-                logger.warning(f"Some dependencies still missing after installation: {still_missing}")
-                return False, f"Failed to install dependencies: {still_missing}"
-            
             logger.info(f"Successfully installed all dependencies for {plugin_id}")
             return True, None
-        except subprocess.CalledProcessError as e:
-            error_msg = f"Failed to install dependencies: {e.stderr if hasattr(e, 'stderr') else str(e)}"
-            logger.error(error_msg, exc_info=True)
-            return False, error_msg
         except Exception as e:
             error_msg = f"Error installing dependencies: {str(e)}"
             logger.error(error_msg, exc_info=True)
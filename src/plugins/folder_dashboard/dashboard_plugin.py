@@ -162,6 +162,9 @@ def generate_dashboard_html(analysis, path):
     # Generate size distribution chart data
     size_dist_data = analysis["size_distribution"]
     
+    # Percentage factor shared by the file type and size distribution lists
+    inv_total = (100.0 / analysis["total_files"]) if analysis["total_files"] else 0.0
+    
     html = f"""
     <div class="folder-dashboard">
         <style>
@@ -301,7 +304,7 @@ def generate_dashboard_html(analysis, path):
     if file_types_data:
         html += "<div class='file-list'>"
         for item in file_types_data:
-            percentage = (item["value"] / analysis["total_files"] * 100) if analysis["total_files"] > 0 else 0
+            percentage = item["value"] * inv_total
             html += f"""
                 <div class="file-item">
                     <span class="file-name">{item['label']}</span>
@@ -325,7 +328,7 @@ def generate_dashboard_html(analysis, path):
     if size_dist_data:
         html += "<div class='file-list'>"
         for item in size_dist_data:
-            percentage = (item["count"] / analysis["total_files"] * 100) if analysis["total_files"] > 0 else 0
+            percentage = item["count"] * inv_total
             html += f"""
                 <div class="file-item">
                     <span class="file-name">{item['range']}</span>
@@ -3,42 +3,57 @@ Git Repository Analyzer Plugin
 Provides comprehensive Git repository analysis with beautiful visualizations
 """
 import os
+import string
 import subprocess
 import tempfile
 import json
 import datetime
+import functools
+import importlib.util
 import logging
 import sys
+import threading
 from pathlib import Path
 import traceback
+from html import escape
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 
-# Setup logging
-logging.basicConfig(level=logging.DEBUG, 
-                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+# Logging is configured by the application; this module only emits records
 logger = logging.getLogger("git_repo_analyzer")
 
 # Import dependencies with fallback for when dependencies aren't installed yet
 try:
     logger.debug("Attempting to import plugin dependencies")
-    import git
-    logger.debug("Successfully imported gitpython")
+    import numpy as np
     import pandas as pd
     logger.debug("Successfully imported pandas")
     import plotly.express as px
     import plotly.graph_objects as go
+    import plotly.io as pio
     from plotly.subplots import make_subplots
+    from plotly.offline import get_plotlyjs_version
+    # Loaded once in the report <head> instead of once per chart
+    PLOTLY_CDN_URL = f"https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"
     logger.debug("Successfully imported plotly")
     from tabulate import tabulate
     logger.debug("Successfully imported tabulate")
     DEPS_INSTALLED = True
     logger.info("All dependencies successfully imported")
 except ImportError as e:
-    logger.error(f"Failed to import dependency: {e}")
+    logger.error("Failed to import dependency: %s", e)
     missing_package = str(e).split("'")[1] if "'" in str(e) else str(e)
-    logger.error(f"Missing package: {missing_package}")
-    logger.debug(f"Python path: {sys.path}")
+    logger.error("Missing package: %s", missing_package)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Python path: %s", sys.path)
     DEPS_INSTALLED = False
 
+# Probed once at import so failed calls do not re-import every dependency
+MISSING_DEPS = () if DEPS_INSTALLED else tuple(
+    dep for dep in ("numpy", "pandas", "plotly", "tabulate")
+    if importlib.util.find_spec(dep) is None
+)
+
 def execute(path, **kwargs):
     """
     Execute the Git repository analysis
@@ -49,48 +64,38 @@ def execute(path, **kwargs):
     Returns:
         dict: Analysis results with HTML content
     """
-    logger.debug(f"Execute called with path: {path}")
-    logger.debug(f"Current working directory: {os.getcwd()}")
-    logger.debug(f"Python executable: {sys.executable}")
-    logger.debug(f"Python version: {sys.version}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Execute called with path: %s", path)
+        logger.debug("Current working directory: %s", os.getcwd())
+        logger.debug("Python executable: %s (%s)", sys.executable, sys.version)
     
     # Check if dependencies are installed
     if not DEPS_INSTALLED:
-        logger.error("Dependencies not installed, cannot proceed")
-        missing_deps = []
-        for dep in ["git", "pandas", "plotly", "tabulate"]:
-            try:
-                __import__(dep)
-                logger.debug(f"Dependency {dep} is available")
-            except ImportError:
-                logger.error(f"Dependency {dep} is missing")
-                missing_deps.append(dep)
+        logger.error("Dependencies not installed, cannot proceed: %s", ", ".join(MISSING_DEPS))
         
         return {
             "success": False,
-            "error": f"Required dependencies not installed: {', '.join(missing_deps)}. Please restart the application to auto-install dependencies."
+            "error": f"Required dependencies not installed: {', '.join(MISSING_DEPS)}. Please restart the application to auto-install dependencies."
         }
     
     try:
+        # Normalize so that equivalent spellings share one cache entry
+        path = os.path.abspath(path)
+        
         # Check if the path is a git repository
-        git_dir = os.path.join(path, '.git')
-        logger.debug(f"Checking if {git_dir} exists")
-        if not os.path.exists(git_dir):
-            logger.warning(f"Path {path} is not a Git repository (no .git directory)")
+        git_dir = find_git_dir(path)
+        if git_dir is None:
+            logger.warning("Path %s is not a Git repository (no .git directory)", path)
             return {
                 "success": False,
                 "error": f"The directory {path} is not a Git repository."
             }
+        logger.debug("Found git directory %s", git_dir)
         
-        # Initialize repository object
-        logger.debug(f"Initializing Git repository at {path}")
-        repo = git.Repo(path)
-        logger.debug(f"Git repository initialized: {repo}")
-        
-        # Generate the report
-        logger.info(f"Generating Git report for repository at {path}")
-        html_content = generate_git_report(repo, path)
-        logger.debug(f"Generated HTML report ({len(html_content)} characters)")
+        # Generate the report, reusing the cached one if HEAD, the index and the refs are unchanged
+        logger.info("Generating Git report for repository at %s", path)
+        html_content = _cached_report(path, git_dir, get_report_cache_key(git_dir))
+        logger.debug("Generated HTML report (%d characters)", len(html_content))
         
         return {
             "success": True,
@@ -101,204 +106,346 @@ def execute(path, **kwargs):
         
     except Exception as e:
         error_details = traceback.format_exc()
-        logger.error(f"Error analyzing Git repository: {e}")
-        logger.debug(f"Error details: {error_details}")
+        logger.error("Error analyzing Git repository: %s", e)
+        logger.debug("Error details: %s", error_details)
         return {
             "success": False,
             "error": f"Error analyzing Git repository: {str(e)}\n\n{error_details}"
         }
 
-def generate_git_report(repo, repo_path):
+def find_git_dir(path):
     """
-    Generate a comprehensive HTML report for the Git repository
+    Locate the git directory of the working tree at path, without spawning git
+    
+    Linked worktrees and submodules have a .git file holding
+    "gitdir: <path>" instead of a .git directory.
     
-    Args:
-        repo: GitPython repository object
-        repo_path: Path to the repository
-        
     Returns:
-        str: HTML content for the report
+        str: Path to the git directory, or None if path is not a repository
     """
-    # Collect repository information
-    repo_info = get_repo_info(repo, repo_path)
-    branch_info = get_branch_info(repo)
-    commit_history = get_commit_history(repo)
-    commit_stats = analyze_commit_stats(commit_history)
-    file_stats = get_file_stats(repo)
+    dot_git = os.path.join(path, '.git')
+    if os.path.isdir(dot_git):
+        return dot_git
+    try:
+        with open(dot_git, 'r', encoding='utf-8') as f:
+            content = f.read().strip()
+    except OSError:
+        return None
+    if not content.startswith('gitdir: '):
+        return None
+    git_dir = os.path.join(path, content[len('gitdir: '):])
+    return os.path.normpath(git_dir) if os.path.isdir(git_dir) else None
+
+def get_common_dir(git_dir):
+    """Return the directory holding shared refs and objects (differs from git_dir in linked worktrees)"""
+    try:
+        with open(os.path.join(git_dir, 'commondir'), 'r', encoding='utf-8') as f:
+            return os.path.normpath(os.path.join(git_dir, f.read().strip()))
+    except FileNotFoundError:
+        return git_dir
+
+def read_head_ref(git_dir):
+    """Return the contents of HEAD: b'ref: <refname>' or a detached commit SHA"""
+    with open(os.path.join(git_dir, 'HEAD'), 'rb') as f:
+        return f.read().strip()
+
+def read_head_sha(git_dir):
+    """
+    Resolve HEAD to a commit SHA by reading the ref files directly
     
-    # Generate charts
-    commits_over_time_chart = generate_commits_over_time_chart(commit_history)
-    author_distribution_chart = generate_author_distribution_chart(commit_history)
-    file_types_chart = generate_file_types_chart(file_stats)
+    Returns None for a repository without commits.
+    """
+    head = read_head_ref(git_dir)
+    if not head.startswith(b'ref: '):
+        return head  # Detached HEAD holds the SHA itself
     
-    # Create a context dictionary for the format string to avoid duplicate keyword arguments
-    format_data = {
-        'repo_name': os.path.basename(repo_path),
-        'repo_path': repo_info['path'],
-        'current_branch': repo_info['current_branch'],
-        'repo_size': repo_info['size'],
-        'commits_over_time_chart': commits_over_time_chart,
-        'author_distribution_chart': author_distribution_chart,
-        'file_types_chart': file_types_chart,
-        'total_commits': commit_stats['total_commits'],
-        'total_authors': commit_stats['total_authors'],
-        'branch_count': branch_info['count'],
-        'tags_count': repo_info['tags_count'],
-        'first_commit_date': commit_stats['first_commit_date'],
-        'last_commit_date': commit_stats['last_commit_date'],
-        'repo_age': commit_stats['repo_age'],
-        'most_active_author': commit_stats['most_active_author'],
-        'most_active_author_commits': commit_stats['most_active_author_commits']
-    }
+    ref = os.fsdecode(head[5:])
+    common_dir = get_common_dir(git_dir)
+    # Branches are shared by all worktrees, so they live in the common directory
+    for ref_dir in dict.fromkeys((git_dir, common_dir)):
+        try:
+            with open(os.path.join(ref_dir, ref), 'rb') as f:
+                return f.read().strip()
+        except FileNotFoundError:
+            pass
+    
+    # The ref may only exist in packed-refs ("<sha> <ref>" per line)
+    try:
+        with open(os.path.join(common_dir, 'packed-refs'), 'rb') as f:
+            for line in f:
+                sha, _, name = line.rstrip(b'\n').partition(b' ')
+                if name == head[5:]:
+                    return sha
+    except FileNotFoundError:
+        pass
+    return None
+
+def stat_stamp(path):
+    """Return the (mtime_ns, size) stamp of path, or None if it does not exist"""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+def get_refs_stamp(git_dir):
+    """
+    Return stat stamps covering the branches, remotes and tags shown in a report
+    
+    A loose ref is created, moved or deleted by renaming a file in its
+    directory, which updates that directory's mtime; packed refs and
+    remote URLs live in packed-refs and config.
+    """
+    common_dir = get_common_dir(git_dir)
+    stamps = [
+        stat_stamp(os.path.join(common_dir, 'packed-refs')),
+        stat_stamp(os.path.join(common_dir, 'config'))
+    ]
+    # Branch names may contain '/', so every directory below each ref namespace counts
+    stack = [os.path.join(common_dir, 'refs', name) for name in ('heads', 'remotes', 'tags')]
+    while stack:
+        directory = stack.pop()
+        stamps.append((directory, stat_stamp(directory)))
+        try:
+            with os.scandir(directory) as entries:
+                stack.extend(entry.path for entry in entries if entry.is_dir(follow_symlinks=False))
+        except OSError:
+            pass
+    return tuple(stamps)
+
+def get_report_cache_key(git_dir):
+    """Return the (HEAD sha, index mtime, refs stamp) tuple that identifies a report"""
+    # Every part is read from the git directory without spawning git
+    head_sha = read_head_sha(git_dir)
+    
+    try:
+        index_mtime = os.stat(os.path.join(git_dir, 'index')).st_mtime_ns
+    except FileNotFoundError:
+        index_mtime = None
+    return head_sha, index_mtime, get_refs_stamp(git_dir)
+
+def ensure_commit_graph(path, git_dir):
+    """
+    Start writing a commit-graph file for large repositories that do not have one
+    
+    With a commit-graph, git log reads parent links from one packed file
+    instead of decoding every commit object during history traversal.
+    Small repositories are skipped, since writing costs more than it saves.
+    The write runs on a background thread, so the current report does not
+    wait for it; later reports use the graph.
+    
+    Returns:
+        threading.Thread: The thread writing the graph, or None if none was started
+    """
+    # Objects are shared between worktrees
+    objects_dir = os.path.join(get_common_dir(git_dir), 'objects')
+    objects_info = os.path.join(objects_dir, 'info')
+    if (os.path.exists(os.path.join(objects_info, 'commit-graph'))
+            or os.path.isdir(os.path.join(objects_info, 'commit-graphs'))):
+        return None
+    
+    pack_dir = os.path.join(objects_dir, 'pack')
+    try:
+        with os.scandir(pack_dir) as entries:
+            pack_size = sum(entry.stat().st_size for entry in entries if entry.name.endswith('.pack'))
+    except OSError:
+        return None
+    if pack_size < COMMIT_GRAPH_MIN_PACK_SIZE:
+        return None
     
-    # Build remotes HTML
-    remotes_html = ""
-    for name, url in repo_info['remotes'].items():
-        remotes_html += f"""
+    # One write per repository at a time
+    with _commit_graph_lock:
+        if objects_dir in _commit_graph_writes:
+            return None
+        _commit_graph_writes.add(objects_dir)
+    thread = threading.Thread(
+        target=write_commit_graph, args=(path, objects_dir),
+        name="commit-graph-write", daemon=True
+    )
+    thread.start()
+    return thread
+
+def write_commit_graph(path, objects_dir):
+    """Run git commit-graph write for the repository at path, giving up after COMMIT_GRAPH_TIMEOUT"""
+    logger.info("Writing commit-graph for repository at %s", path)
+    try:
+        subprocess.run(
+            ['git', 'commit-graph', 'write', '--reachable'],
+            cwd=path,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=False,
+            timeout=COMMIT_GRAPH_TIMEOUT
+        )
+    except subprocess.TimeoutExpired:
+        logger.warning("Writing commit-graph for %s timed out after %s seconds", path, COMMIT_GRAPH_TIMEOUT)
+    finally:
+        with _commit_graph_lock:
+            _commit_graph_writes.discard(objects_dir)
+
+@functools.lru_cache(maxsize=32)
+def _cached_report(path, git_dir, cache_key):
+    """Generate the report for a repository state; cached per path and get_report_cache_key"""
+    ensure_commit_graph(path, git_dir)
+    return generate_git_report(path, git_dir)
+
+# Repositories with less packed object data than this are not given a commit-graph
+COMMIT_GRAPH_MIN_PACK_SIZE = 50 * 1024 * 1024
+
+# Seconds a background commit-graph write may run before it is killed
+COMMIT_GRAPH_TIMEOUT = 600
+
+# Object directories with a commit-graph write in progress
+_commit_graph_writes = set()
+_commit_graph_lock = threading.Lock()
+
+# Below these sizes the activity and author charts are rendered as plain tables
+MIN_COMMITS_FOR_CHART = 30
+MAX_AUTHORS_FOR_TABLE = 3
+
+# Shared by all charts; the config is serialized once for the Plotly.newPlot calls
+CHART_MARGIN = dict(l=10, r=10, t=40, b=10)
+PLOTLY_CONFIG_JSON = json.dumps({'responsive': True})
+
+# History beyond this many commits is summarized without being walked
+MAX_COMMITS = 20000
+
+# Table rows of the report
+REMOTE_ROW = """
             <tr>
                 <th>{name}</th>
                 <td>{url}</td>
             </tr>
         """
-    
-    # Build branches HTML
-    branches_html = ""
-    for branch in branch_info['branches']:
-        current_marker = "✅ " if branch['is_current'] else ""
-        css_class = 'branch-current' if branch['is_current'] else ''
-        branches_html += f"""
+BRANCH_ROW = """
             <tr class="{css_class}">
-                <td>{current_marker}{branch['name']}</td>
-                <td class="commit-hash">{branch['last_commit_hash']}</td>
-                <td>{branch['last_commit_date']}</td>
+                <td>{current_marker}{name}</td>
+                <td class="commit-hash">{last_commit_hash}</td>
+                <td>{last_commit_date}</td>
             </tr>
         """
-    
-    # Build recent commits HTML
-    commits_html = ""
-    for commit in commit_history['commits'][:10]:  # Show only 10 most recent commits
-        commits_html += f"""
+COMMIT_ROW = """
             <tr>
-                <td class="commit-hash">{commit['hash'][:7]}</td>
-                <td>{commit['author']}</td>
-                <td>{commit['date']}</td>
-                <td class="commit-message" title="{commit['message']}">{commit['message']}</td>
+                <td class="commit-hash">{short_hash}</td>
+                <td>{author}</td>
+                <td>{date}</td>
+                <td class="commit-message" title="{message}">{message}</td>
             </tr>
         """
-    
-    # Start building HTML content
-    html = f"""
+
+# Outer HTML shell of the report, parsed once at import time
+REPORT_TEMPLATE = string.Template("""
     <!DOCTYPE html>
     <html lang="en">
     <head>
         <meta charset="UTF-8">
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>Git Repository Analysis: {format_data['repo_name']}</title>
+        <title>Git Repository Analysis: $repo_name</title>
         <style>
-            body {{
+            body {
                 font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
                 line-height: 1.6;
                 color: #333;
                 margin: 0;
                 padding: 0;
                 background-color: #f8f9fa;
-            }}
+            }
             
             /* Main layout */
-            .container {{
+            .container {
                 padding: 0;
                 max-width: 100%;
-            }}
+            }
             
             /* Header */
-            .header {{
+            .header {
                 background-color: #fff;
                 padding: 20px;
                 border-bottom: 2px solid #3498db;
                 margin-bottom: 20px;
-            }}
-            .header h1 {{
+            }
+            .header h1 {
                 margin: 0;
                 color: #2c3e50;
                 font-size: 1.8rem;
                 font-weight: 600;
-            }}
+            }
             
             /* Main content */
-            .main-content {{
+            .main-content {
                 padding: 0 20px 20px 20px;
-            }}
+            }
             
             /* Two column layout */
-            .row {{
+            .row {
                 display: flex;
                 flex-wrap: wrap;
                 margin: 0 -10px;
-            }}
-            .col {{
+            }
+            .col {
                 flex: 1;
                 padding: 0 10px;
                 min-width: 300px;
                 margin-bottom: 20px;
-            }}
-            .col-full {{
+            }
+            .col-full {
                 flex-basis: 100%;
                 padding: 0 10px;
                 margin-bottom: 20px;
-            }}
+            }
             
             /* Cards */
-            .card {{
+            .card {
                 background: white;
                 border-radius: 8px;
                 box-shadow: 0 2px 8px rgba(0, 0, 0, 0.1);
                 padding: 20px;
                 height: 100%;
                 box-sizing: border-box;
-            }}
+            }
             
             /* Headings */
-            h2 {{
+            h2 {
                 margin-top: 0;
                 color: #2c3e50;
                 border-bottom: 1px solid #eee;
                 padding-bottom: 10px;
                 font-size: 1.4rem;
-            }}
-            h3 {{
+            }
+            h3 {
                 color: #2c3e50;
                 font-size: 1.1rem;
                 margin-top: 20px;
                 margin-bottom: 10px;
-            }}
+            }
             
             /* Tables */
-            table {{
+            table {
                 width: 100%;
                 border-collapse: collapse;
                 margin: 15px 0;
                 font-size: 14px;
-            }}
-            th, td {{
+            }
+            th, td {
                 padding: 10px;
                 text-align: left;
                 border-bottom: 1px solid #eee;
-            }}
-            th {{
+            }
+            th {
                 background-color: #f8f9fa;
                 font-weight: 600;
-            }}
-            tr:hover {{
+            }
+            tr:hover {
                 background-color: #f5f5f5;
-            }}
+            }
             
             /* Stat boxes */
-            .stat-grid {{
+            .stat-grid {
                 display: flex;
                 flex-wrap: wrap;
                 margin: 0 -5px;
-            }}
-            .stat-box {{
+            }
+            .stat-box {
                 flex: 1 0 45%;
                 background: #f8f9fa;
                 border-radius: 6px;
@@ -308,98 +455,99 @@ def generate_git_report(repo, repo_path):
                 transition: transform 0.2s;
                 margin: 5px;
                 min-width: 120px;
-            }}
-            .stat-box:hover {{
+            }
+            .stat-box:hover {
                 transform: translateY(-2px);
                 box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-            }}
-            .stat-value {{
+            }
+            .stat-value {
                 font-size: 24px;
                 font-weight: bold;
                 color: #3498db;
                 margin: 10px 0;
-            }}
-            .stat-label {{
+            }
+            .stat-label {
                 font-size: 14px;
                 color: #7f8c8d;
-            }}
+            }
             
             /* Charts */
-            .chart-container {{
+            .chart-container {
                 width: 100%;
                 height: 350px;
                 margin: 15px 0;
-            }}
+            }
             
             /* Scrolling containers */
-            .scrollable {{
+            .scrollable {
                 max-height: 350px;
                 overflow-y: auto;
                 border: 1px solid #eee;
                 border-radius: 4px;
-            }}
+            }
             
             /* Utility classes */
-            .branch-current {{
+            .branch-current {
                 font-weight: bold;
                 color: #27ae60;
-            }}
-            .commit-hash {{
+            }
+            .commit-hash {
                 font-family: monospace;
                 color: #e74c3c;
-            }}
-            .commit-message {{
+            }
+            .commit-message {
                 font-style: italic;
                 max-width: 300px;
                 white-space: nowrap;
                 overflow: hidden;
                 text-overflow: ellipsis;
                 display: block;
-            }}
+            }
             
             /* Responsive adjustments */
-            @media (max-width: 768px) {{
-                .col {{
+            @media (max-width: 768px) {
+                .col {
                     flex-basis: 100%;
-                }}
-                .header {{
+                }
+                .header {
                     padding: 15px;
-                }}
-                .header h1 {{
+                }
+                .header h1 {
                     font-size: 1.5rem;
-                }}
-                .chart-container {{
+                }
+                .chart-container {
                     height: 300px;
-                }}
-            }}
+                }
+            }
         </style>
+        <script src="$plotly_cdn_url" charset="utf-8"></script>
         <script>
-            document.addEventListener('DOMContentLoaded', function() {{
+            document.addEventListener('DOMContentLoaded', function() {
                 // Make sure charts render properly
-                if (window.Plotly) {{
-                    setTimeout(() => {{
+                if (window.Plotly) {
+                    setTimeout(() => {
                         const plots = document.querySelectorAll('.js-plotly-plot');
-                        plots.forEach(plot => {{
+                        plots.forEach(plot => {
                             window.Plotly.Plots.resize(plot);
-                        }});
-                    }}, 100);
-                }}
-            }});
+                        });
+                    }, 100);
+                }
+            });
             
-            window.addEventListener('resize', function() {{
-                if (window.Plotly) {{
+            window.addEventListener('resize', function() {
+                if (window.Plotly) {
                     const plots = document.querySelectorAll('.js-plotly-plot');
-                    plots.forEach(plot => {{
+                    plots.forEach(plot => {
                         window.Plotly.Plots.resize(plot);
-                    }});
-                }}
-            }});
+                    });
+                }
+            });
         </script>
     </head>
     <body>
         <div class="container">
             <div class="header">
-                <h1>Git Repository Analysis: {format_data['repo_name']}</h1>
+                <h1>Git Repository Analysis: $repo_name</h1>
             </div>
             
             <div class="main-content">
@@ -411,21 +559,21 @@ def generate_git_report(repo, repo_path):
                             <table>
                                 <tr>
                                     <th>Repository Path</th>
-                                    <td>{format_data['repo_path']}</td>
+                                    <td>$repo_path</td>
                                 </tr>
                                 <tr>
                                     <th>Current Branch</th>
-                                    <td>{format_data['current_branch']}</td>
+                                    <td>$current_branch</td>
                                 </tr>
                                 <tr>
                                     <th>Repository Size</th>
-                                    <td>{format_data['repo_size']}</td>
+                                    <td>$repo_size</td>
                                 </tr>
                             </table>
                             
                             <h3>Remote Information</h3>
                             <table>
-                                {remotes_html}
+                                $remotes_html
                             </table>
                         </div>
                     </div>
@@ -436,19 +584,19 @@ def generate_git_report(repo, repo_path):
                             <h2>Repository Statistics</h2>
                             <div class="stat-grid">
                                 <div class="stat-box">
-                                    <div class="stat-value">{format_data['total_commits']}</div>
+                                    <div class="stat-value">$total_commits</div>
                                     <div class="stat-label">Total Commits</div>
                                 </div>
                                 <div class="stat-box">
-                                    <div class="stat-value">{format_data['total_authors']}</div>
+                                    <div class="stat-value">$total_authors</div>
                                     <div class="stat-label">Contributors</div>
                                 </div>
                                 <div class="stat-box">
-                                    <div class="stat-value">{format_data['branch_count']}</div>
+                                    <div class="stat-value">$branch_count</div>
                                     <div class="stat-label">Branches</div>
                                 </div>
                                 <div class="stat-box">
-                                    <div class="stat-value">{format_data['tags_count']}</div>
+                                    <div class="stat-value">$tags_count</div>
                                     <div class="stat-label">Tags</div>
                                 </div>
                             </div>
@@ -457,19 +605,19 @@ def generate_git_report(repo, repo_path):
                             <table>
                                 <tr>
                                     <th>First Commit</th>
-                                    <td>{format_data['first_commit_date']}</td>
+                                    <td>$first_commit_date</td>
                                 </tr>
                                 <tr>
                                     <th>Last Commit</th>
-                                    <td>{format_data['last_commit_date']}</td>
+                                    <td>$last_commit_date</td>
                                 </tr>
                                 <tr>
                                     <th>Repository Age</th>
-                                    <td>{format_data['repo_age']}</td>
+                                    <td>$repo_age</td>
                                 </tr>
                                 <tr>
                                     <th>Most Active Author</th>
-                                    <td>{format_data['most_active_author']} ({format_data['most_active_author_commits']} commits)</td>
+                                    <td>$most_active_author ($most_active_author_commits commits)</td>
                                 </tr>
                             </table>
                         </div>
@@ -480,7 +628,7 @@ def generate_git_report(repo, repo_path):
                         <div class="card">
                             <h2>Commit Activity Over Time</h2>
                             <div class="chart-container" id="commits-over-time">
-                                {format_data['commits_over_time_chart']}
+                                $commits_over_time_chart
                             </div>
                         </div>
                     </div>
@@ -490,7 +638,7 @@ def generate_git_report(repo, repo_path):
                         <div class="card">
                             <h2>Commits by Author</h2>
                             <div class="chart-container" id="author-distribution">
-                                {format_data['author_distribution_chart']}
+                                $author_distribution_chart
                             </div>
                         </div>
                     </div>
@@ -500,7 +648,7 @@ def generate_git_report(repo, repo_path):
                         <div class="card">
                             <h2>File Types Distribution</h2>
                             <div class="chart-container" id="file-types">
-                                {format_data['file_types_chart']}
+                                $file_types_chart
                             </div>
                         </div>
                     </div>
@@ -508,7 +656,7 @@ def generate_git_report(repo, repo_path):
                     <!-- Branches -->
                     <div class="col">
                         <div class="card">
-                            <h2>Branches ({format_data['branch_count']})</h2>
+                            <h2>Branches ($branch_count)</h2>
                             <div class="scrollable">
                                 <table>
                                     <tr>
@@ -516,7 +664,7 @@ def generate_git_report(repo, repo_path):
                                         <th>Last Commit</th>
                                         <th>Last Active</th>
                                     </tr>
-                                    {branches_html}
+                                    $branches_html
                                 </table>
                             </div>
                         </div>
@@ -534,7 +682,7 @@ def generate_git_report(repo, repo_path):
                                         <th>Date</th>
                                         <th>Message</th>
                                     </tr>
-                                    {commits_html}
+                                    $commits_html
                                 </table>
                             </div>
                         </div>
@@ -544,20 +692,111 @@ def generate_git_report(repo, repo_path):
         </div>
     </body>
     </html>
+    """)
+
+def generate_git_report(repo_path, git_dir):
+    """
+    Generate a comprehensive HTML report for the Git repository
+    
+    Args:
+        repo_path: Path to the repository working tree
+        git_dir: Path to the repository's git directory
+        
+    Returns:
+        str: HTML content for the report
     """
+    # Collect repository information. Each collector runs its own git
+    # subprocess, so they run concurrently in worker threads
+    # A repository without commits has no history for git log to walk
+    has_commits = read_head_sha(git_dir) is not None
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        commit_history_future = executor.submit(get_commit_history, repo_path, has_commits=has_commits)
+        branch_info_future = executor.submit(get_branch_info, repo_path)
+        file_stats_future = executor.submit(get_file_stats, repo_path)
+        # get_repo_info reads its size from the tree stats cached by get_file_stats
+        file_stats = file_stats_future.result()
+        repo_info = get_repo_info(repo_path, git_dir)
+        branch_info = branch_info_future.result()
+        commit_history = commit_history_future.result()
+    commit_stats = analyze_commit_stats(commit_history)
+    
+    # Generate charts; the three figures are independent so they are built concurrently
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        commits_over_time_future = executor.submit(generate_commits_over_time_chart, commit_history)
+        author_distribution_future = executor.submit(generate_author_distribution_chart, commit_stats['authors'])
+        file_types_future = executor.submit(generate_file_types_chart, file_stats)
+        commits_over_time_chart = commits_over_time_future.result()
+        author_distribution_chart = author_distribution_future.result()
+        file_types_chart = file_types_future.result()
+    
+    # Build the substitution context for the report template
+    format_data = {
+        'repo_name': escape(os.path.basename(repo_path)),
+        'repo_path': escape(repo_info['path']),
+        'current_branch': escape(repo_info['current_branch']),
+        'repo_size': repo_info['size'],
+        'commits_over_time_chart': commits_over_time_chart,
+        'author_distribution_chart': author_distribution_chart,
+        'file_types_chart': file_types_chart,
+        'total_commits': commit_stats['total_commits'],
+        'total_authors': commit_stats['total_authors'],
+        'branch_count': branch_info['count'],
+        'tags_count': repo_info['tags_count'],
+        'first_commit_date': commit_stats['first_commit_date'],
+        'last_commit_date': commit_stats['last_commit_date'],
+        'repo_age': commit_stats['repo_age'],
+        'most_active_author': escape(commit_stats['most_active_author']),
+        'most_active_author_commits': commit_stats['most_active_author_commits'],
+        'plotly_cdn_url': PLOTLY_CDN_URL
+    }
+    
+    # Build the table rows; values are escaped once as each row is formatted
+    format_data['remotes_html'] = "".join(
+        REMOTE_ROW.format(name=escape(name), url=escape(url))
+        for name, url in repo_info['remotes'].items()
+    )
+    format_data['branches_html'] = "".join(
+        BRANCH_ROW.format(
+            css_class='branch-current' if branch['is_current'] else '',
+            current_marker="✅ " if branch['is_current'] else "",
+            name=escape(branch['name']),
+            last_commit_hash=branch['last_commit_hash'],
+            last_commit_date=branch['last_commit_date']
+        )
+        for branch in branch_info['branches']
+    )
+    format_data['commits_html'] = "".join(
+        COMMIT_ROW.format(
+            short_hash=commit['hash'][:7],
+            author=escape(commit['author']),
+            date=datetime.datetime.fromtimestamp(commit['timestamp']).strftime("%Y-%m-%d %H:%M"),
+            message=escape(commit['message'])
+        )
+        for commit in commit_history['recent']
+    )
     
-    return html
+    return REPORT_TEMPLATE.substitute(format_data)
 
-def get_repo_info(repo, path):
+def get_repo_info(path, git_dir):
     """Get basic repository information"""
     # Get current branch
-    try:
-        current_branch = repo.active_branch.name
-    except:
+    head = read_head_ref(git_dir)
+    if head.startswith(b'ref: refs/heads/'):
+        current_branch = os.fsdecode(head[len(b'ref: refs/heads/'):])
+    else:
         current_branch = "(detached HEAD)"
     
-    # Get remotes
-    remotes = {remote.name: remote.url for remote in repo.remotes}
+    # Get remotes; with -z each entry is "remote.<name>.url\n<url>\0"
+    # (exit status 1 just means there are none)
+    result = subprocess.run(
+        ['git', 'config', '-z', '--get-regexp', r'^remote\..*\.url$'],
+        cwd=path, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=False
+    )
+    remotes = {}
+    for entry in result.stdout.decode('utf-8', errors='replace').split('\0'):
+        if entry:
+            key, _, url = entry.partition('\n')
+            remotes[key[len('remote.'):-len('.url')]] = url
     
     # Get repository size
     size_bytes = get_repo_size(path)
@@ -569,7 +808,9 @@ def get_repo_info(repo, path):
         size = f"{size_bytes/(1024*1024):.1f} MB"
     
     # Get tags count
-    tags_count = len(list(repo.tags))
+    tags_count = subprocess.check_output(
+        ['git', 'for-each-ref', '--format=x', 'refs/tags'], cwd=path
+    ).count(b'\n')
     
     return {
         "path": path,
@@ -579,24 +820,27 @@ def get_repo_info(repo, path):
         "tags_count": tags_count
     }
 
-def get_branch_info(repo):
+def get_branch_info(path):
     """Get information about all branches"""
     branches = []
-    current_branch_name = ""
-    try:
-        current_branch_name = repo.active_branch.name
-    except:
-        current_branch_name = "(detached HEAD)"
-    
-    for branch in repo.branches:
-        # Get last commit on branch
-        last_commit = list(repo.iter_commits(branch.name, max_count=1))[0]
-        commit_date = datetime.datetime.fromtimestamp(last_commit.committed_date)
+    
+    # One for-each-ref call lists every branch with its tip commit; %(HEAD)
+    # marks the checked-out branch with '*', so no separate HEAD lookup is needed
+    output = subprocess.check_output(
+        ['git', 'for-each-ref',
+         '--format=%(HEAD)%00%(refname:short)%00%(objectname:short=7)%00%(committerdate:unix)',
+         'refs/heads'],
+        cwd=path
+    )
+    
+    for line in output.decode('utf-8', errors='replace').splitlines():
+        head_marker, name, commit_hash, committed_date = line.split('\0')
+        commit_date = datetime.datetime.fromtimestamp(int(committed_date))
         
         branches.append({
-            "name": branch.name,
-            "is_current": branch.name == current_branch_name,
-            "last_commit_hash": last_commit.hexsha[:7],
+            "name": name,
+            "is_current": head_marker == '*',
+            "last_commit_hash": commit_hash,
             "last_commit_date": commit_date.strftime("%Y-%m-%d %H:%M")
         })
     
@@ -608,30 +852,91 @@ def get_branch_info(repo):
         "branches": branches
     }
 
-def get_commit_history(repo):
-    """Get commit history from the repository"""
-    commits = []
-    for commit in repo.iter_commits():
-        commit_date = datetime.datetime.fromtimestamp(commit.committed_date)
-        commits.append({
-            "hash": commit.hexsha,
-            "author": commit.author.name,
-            "author_email": commit.author.email,
-            "date": commit_date.strftime("%Y-%m-%d %H:%M"),
-            "timestamp": commit.committed_date,
-            "message": commit.message.strip().split('\n')[0],  # Only first line of commit message
-            "stats": commit.stats.total
-        })
+def iter_commits(path, log_args=()):
+    """
+    Yield commits from the repository one at a time, newest first
+    
+    Args:
+        path: Path to the repository
+        log_args: Extra git log arguments, e.g. ['-n', '100']
+    """
+    # A single NUL-separated git log stream replaces per-commit
+    # object decoding, and commits are parsed as the output arrives
+    records = iter_git_records(
+        ['log', '-z', '--pretty=format:%H%x1f%aN%x1f%ae%x1f%ct%x1f%s', *log_args],
+        path
+    )
+    for record in records:
+        commit_hash, author, author_email, committed_date, subject = (
+            record.decode('utf-8', errors='replace').split('\x1f', 4)
+        )
+        yield {
+            "hash": commit_hash,
+            "author": author,
+            "author_email": author_email,
+            "timestamp": int(committed_date),  # Formatted only where it is displayed
+            "message": subject  # Only first line of commit message
+        }
+
+def get_commit_history(path, recent_count=10, max_commits=MAX_COMMITS, has_commits=True):
+    """
+    Aggregate the commit history in a single pass
+    
+    Only the aggregates used by the report are kept: commits per author,
+    the commit timestamps for the activity chart, the oldest and newest commits and the most recent
+    commits for the "Recent Commits" table.
+    
+    At most max_commits recent commits are walked. For longer histories the
+    activity chart covers that window, while the total, the per-author
+    counts and the first commit are still looked up for the whole history.
+    has_commits=False (unborn HEAD) returns an empty history without running git.
+    """
+    authors = Counter()
+    timestamps = []
+    recent = []
+    first_commit = None
+    last_commit = None
+    total = 0
+    
+    commits = iter_commits(path, ['-n', str(max_commits)]) if has_commits else ()
+    for commit in commits:
+        total += 1
+        authors[commit['author']] += 1
+        timestamps.append(commit['timestamp'])
+        if total <= recent_count:
+            recent.append(commit)
+        if first_commit is None or commit['timestamp'] < first_commit['timestamp']:
+            first_commit = commit
+        if last_commit is None or commit['timestamp'] > last_commit['timestamp']:
+            last_commit = commit
+    
+    if total == max_commits:
+        # The walk was cut short: count without decoding commits, and
+        # take the first commit from the root commits only
+        total = int(subprocess.check_output(['git', 'rev-list', '--count', 'HEAD'], cwd=path))
+        # shortlog counts commits per author in git itself ("<count>\t<name>" lines);
+        # author names above use %aN, so both apply .mailmap the same way
+        shortlog = subprocess.check_output(['git', 'shortlog', '-sn', 'HEAD'], cwd=path)
+        authors = Counter()
+        for line in shortlog.decode('utf-8', errors='replace').splitlines():
+            count, _, name = line.strip().partition('\t')
+            authors[name] = int(count)
+        for commit in iter_commits(path, ['--max-parents=0']):
+            if commit['timestamp'] < first_commit['timestamp']:
+                first_commit = commit
     
     return {
-        "commits": commits
+        "total_commits": total,
+        "authors": authors,
+        "timestamps": timestamps,
+        "recent": recent,
+        "first_commit": first_commit,
+        "last_commit": last_commit
     }
 
 def analyze_commit_stats(commit_history):
     """Analyze commit statistics"""
-    commits = commit_history['commits']
-    
-    if not commits:
+    if not commit_history['total_commits']:
         return {
             "total_commits": 0,
             "total_authors": 0,
@@ -639,21 +944,18 @@ def analyze_commit_stats(commit_history):
             "last_commit_date": "N/A",
             "repo_age": "N/A",
             "most_active_author": "N/A",
-            "most_active_author_commits": 0
+            "most_active_author_commits": 0,
+            "authors": Counter()
         }
     
-    # Count commits by author
-    authors = {}
-    for commit in commits:
-        author = commit['author']
-        authors[author] = authors.get(author, 0) + 1
+    authors = commit_history['authors']
     
     # Find most active author
-    most_active_author = max(authors.items(), key=lambda x: x[1]) if authors else ("None", 0)
+    most_active_author = authors.most_common(1)[0] if authors else ("None", 0)
     
     # Get first and last commit dates
-    first_commit = commits[-1]
-    last_commit = commits[0]
+    first_commit = commit_history['first_commit']
+    last_commit = commit_history['last_commit']
     
     first_date = datetime.datetime.fromtimestamp(first_commit['timestamp'])
     last_date = datetime.datetime.fromtimestamp(last_commit['timestamp'])
@@ -673,42 +975,93 @@ def analyze_commit_stats(commit_history):
         repo_age = f"{years} years, {months} months"
     
     return {
-        "total_commits": len(commits),
+        "total_commits": commit_history['total_commits'],
         "total_authors": len(authors),
-        "first_commit_date": first_commit['date'],
-        "last_commit_date": last_commit['date'],
+        "first_commit_date": first_date.strftime("%Y-%m-%d %H:%M"),
+        "last_commit_date": last_date.strftime("%Y-%m-%d %H:%M"),
         "repo_age": repo_age,
         "most_active_author": most_active_author[0],
-        "most_active_author_commits": most_active_author[1]
+        "most_active_author_commits": most_active_author[1],
+        "authors": authors
     }
 
-def get_file_stats(repo):
+def iter_git_records(args, cwd, chunk_size=64 * 1024):
+    """
+    Run a git command and yield its NUL-separated output records as bytes
+    
+    Output is read in chunks while git is still running, so the full
+    listing is never held in memory at once.
+    """
+    process = subprocess.Popen(['git'] + args, cwd=cwd, stdout=subprocess.PIPE)
+    with process:
+        remainder = b''
+        for chunk in iter(lambda: process.stdout.read(chunk_size), b''):
+            records = (remainder + chunk).split(b'\0')
+            remainder = records.pop()
+            yield from records
+        if remainder:
+            yield remainder
+    if process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, ['git'] + args)
+
+def collect_tree_stats(path):
+    """
+    Collect total size, file count and extension counts of the tracked files
+    
+    Both get_repo_size and get_file_stats read from this, so the repository
+    listing is walked once per report.
+    
+    Returns:
+        tuple: (total_size, extensions Counter, total_files)
+    """
+    # The stats only change with the tracked tree, so they are cached per tree SHA
+    tree_sha = subprocess.check_output(
+        ['git', 'rev-parse', 'HEAD^{tree}'], cwd=path, stderr=subprocess.DEVNULL
+    ).strip()
+    return _tree_stats(path, tree_sha)
+
+@functools.lru_cache(maxsize=16)
+def _tree_stats(path, tree_sha):
+    """Walk a tree listing once; cached per (path, tree SHA)"""
+    total_size = 0
+    total_files = 0
+    extensions = Counter()
+    # ls-tree -l reports the blob size of every tracked file, so sizes
+    # come from git without stat-ing the files
+    for entry in iter_git_records(['ls-tree', '-r', '-l', '-z', tree_sha.decode('ascii')], path):
+        if not entry:  # Skip empty entries
+            continue
+        # Format: <mode> <type> <object> <size>\t<path>
+        meta, _, file = entry.partition(b'\t')
+        size = meta.split()[3]
+        if size != b'-':  # Submodules have no size
+            total_size += int(size)
+        total_files += 1
+        
+        # Count files by extension (same rules as os.path.splitext: leading
+        # dots of the file name do not start an extension). Paths stay as
+        # bytes and only the distinct extensions are decoded
+        stem, dot, ext = file.rpartition(b'/')[2].rpartition(b'.')
+        extensions[ext if stem.lstrip(b'.') else None] += 1
+    
+    return total_size, extensions, total_files
+
+def get_file_stats(path):
     """Get statistics about files in the repository"""
     try:
-        # Get all files in the repository
-        items = subprocess.check_output(['git', 'ls-files'], cwd=repo.working_dir)
-        files = items.decode('utf-8').strip().split('\n')
-        
-        # Count files by extension
-        extensions = {}
-        for file in files:
-            if file:  # Skip empty lines
-                ext = os.path.splitext(file)[1]
-                if not ext:
-                    ext = '(no extension)'
-                else:
-                    # Remove leading dot from extension
-                    ext = ext[1:]
-                extensions[ext] = extensions.get(ext, 0) + 1
-        
-        # Convert to list of dictionaries for easier processing
-        ext_data = [{"extension": ext, "count": count} for ext, count in extensions.items()]
+        _, extensions, total_files = collect_tree_stats(path)
         
-        # Sort by count (descending)
-        ext_data.sort(key=lambda x: x['count'], reverse=True)
+        # Convert to list of dictionaries, sorted by count (descending)
+        ext_data = [
+            {
+                "extension": os.fsdecode(ext) if ext is not None else '(no extension)',
+                "count": count
+            }
+            for ext, count in extensions.most_common()
+        ]
         
         return {
-            "total_files": len(files),
+            "total_files": total_files,
             "extensions": ext_data
         }
     except Exception as e:
@@ -721,65 +1074,95 @@ def get_file_stats(repo):
 def get_repo_size(path):
     """Calculate the size of the Git repository (excluding .git directory)"""
     try:
-        # Use git to list all files and their sizes
-        output = subprocess.check_output(
-            ['git', 'ls-files', '-z'], 
-            cwd=path
-        )
-        files = output.decode('utf-8').split('\0')
-        
-        total_size = 0
-        for file in files:
-            if file:  # Skip empty entries
-                file_path = os.path.join(path, file)
-                if os.path.exists(file_path):
-                    total_size += os.path.getsize(file_path)
-        
-        return total_size
+        return collect_tree_stats(path)[0]
+    except subprocess.CalledProcessError:
+        # No HEAD tree yet (no commits), so measure the working tree instead
+        try:
+            return _walk_size(path)
+        except OSError:
+            return 0
     except Exception as e:
         return 0
 
+def _walk_size(root):
+    """Sum file sizes under root, skipping .git, using scandir's cached stat data"""
+    total = 0
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.name == '.git':
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                else:
+                    total += entry.stat(follow_symlinks=False).st_size
+    return total
+
+def render_count_table(label_header, count_header, rows):
+    """Render (label, count) pairs as a plain HTML table, used in place of small charts"""
+    table_rows = "".join(
+        f"<tr><td>{escape(str(label))}</td><td>{count}</td></tr>" for label, count in rows
+    )
+    return (
+        f'<div class="scrollable"><table><tr><th>{label_header}</th><th>{count_header}</th></tr>'
+        f'{table_rows}</table></div>'
+    )
+
+def render_figure(fig, div_id):
+    """
+    Render a figure as a div plus a Plotly.newPlot call on its JSON
+    
+    Plotly itself is loaded once by the report's <head>, so each chart only
+    carries its own data and layout.
+    """
+    # Escape "</" so author names or paths cannot close the script tag early
+    figure_json = pio.to_json(fig, validate=False).replace('</', '<\\/')
+    return (
+        f'<div id="{div_id}" class="plotly-graph-div" style="height:100%; width:100%;"></div>'
+        f'<script>(function(){{var fig = {figure_json};'
+        f'Plotly.newPlot("{div_id}", fig.data, fig.layout, {PLOTLY_CONFIG_JSON});}})();</script>'
+    )
+
 def generate_commits_over_time_chart(commit_history):
     """Generate a chart showing commits over time"""
-    commits = commit_history['commits']
+    timestamps = commit_history['timestamps']
     
-    if not commits:
+    if not timestamps:
         return "<p>No commit data available</p>"
     
-    # Prepare data
-    dates = [datetime.datetime.fromtimestamp(commit['timestamp']) for commit in commits]
-    dates.reverse()  # Oldest first
-    
-    # Count commits by day
-    date_counts = {}
-    for date in dates:
-        day_str = date.strftime("%Y-%m-%d")
-        date_counts[day_str] = date_counts.get(day_str, 0) + 1
-    
-    # Convert to pandas DataFrame
-    df = pd.DataFrame({
-        'date': list(date_counts.keys()),
-        'commits': list(date_counts.values())
-    })
-    df['date'] = pd.to_datetime(df['date'])
-    df = df.sort_values('date')
-    
-    # Create figure
-    fig = px.line(df, x='date', y='commits', 
-                  title='Commit Activity Over Time',
-                  labels={'date': 'Date', 'commits': 'Number of Commits'},
-                  template='plotly_white')
-    
-    # Add area below line
-    fig.add_traces(
-        px.area(df, x='date', y='commits', color_discrete_sequence=['rgba(0, 123, 255, 0.2)']).data[0]
-    )
+    # A handful of commits reads better as a table than as a plotly figure
+    if len(timestamps) < MIN_COMMITS_FOR_CHART:
+        # UTC days, matching the chart's ts // 86400 buckets below
+        days = Counter(
+            datetime.datetime.fromtimestamp(ts, datetime.timezone.utc).date().isoformat()
+            for ts in timestamps
+        )
+        return render_count_table('Date', 'Commits', sorted(days.items()))
+    
+    # Bucket commits by day with NumPy; np.unique returns the days sorted, oldest first
+    days = np.fromiter(timestamps, dtype=np.int64, count=len(timestamps)) // 86400
+    unique_days, counts = np.unique(days, return_counts=True)
+    dates = unique_days.astype('datetime64[D]')  # One vectorized cast, no per-day parsing
+    
+    # A single filled scatter trace draws both the line and the shaded area
+    fig = go.Figure(go.Scatter(
+        x=dates, y=counts,
+        mode='lines',
+        fill='tozeroy',
+        line=dict(color='rgb(0, 123, 255)'),
+        fillcolor='rgba(0, 123, 255, 0.2)'
+    ))
     
     # Customize layout
     fig.update_layout(
+        title='Commit Activity Over Time',
+        xaxis_title='Date',
+        yaxis_title='Number of Commits',
+        template='plotly_white',
         showlegend=False,
         hovermode='x unified',
-        margin=dict(l=10, r=10, t=40, b=10),
+        margin=CHART_MARGIN,
         xaxis=dict(
             tickformat='%b %Y',
             tickangle=-45,
@@ -788,48 +1171,44 @@ def generate_commits_over_time_chart(commit_history):
         )
     )
     
-    # Convert to HTML
-    return fig.to_html(include_plotlyjs='cdn', full_html=False, config={'responsive': True})
+    return render_figure(fig, 'commits-over-time-chart')
 
-def generate_author_distribution_chart(commit_history):
-    """Generate a chart showing commit distribution by author"""
-    commits = commit_history['commits']
+def generate_author_distribution_chart(authors):
+    """
+    Generate a chart showing commit distribution by author
     
-    if not commits:
+    Args:
+        authors: Counter of commits per author, as returned by analyze_commit_stats
+    """
+    if not authors:
         return "<p>No commit data available</p>"
     
-    # Count commits by author
-    authors = {}
-    for commit in commits:
-        author = commit['author']
-        authors[author] = authors.get(author, 0) + 1
-    
-    # Convert to pandas DataFrame
-    df = pd.DataFrame({
-        'author': list(authors.keys()),
-        'commits': list(authors.values())
-    })
-    df = df.sort_values('commits', ascending=False)
-    
-    # Limit to top 10 authors
-    if len(df) > 10:
-        others_commits = df.iloc[10:]['commits'].sum()
-        df = df.iloc[:10]
-        df = pd.concat([df, pd.DataFrame({'author': ['Others'], 'commits': [others_commits]})])
-    
-    # Create pie chart
-    fig = px.pie(df, values='commits', names='author',
-                 title='Commits by Author',
-                 template='plotly_white')
+    if len(authors) <= MAX_AUTHORS_FOR_TABLE:
+        return render_count_table('Author', 'Commits', authors.most_common())
+    
+    # Limit to top 10 authors, grouping the rest under "Others"
+    top_authors = authors.most_common(10)
+    others_commits = sum(authors.values()) - sum(count for _, count in top_authors)
+    if others_commits:
+        top_authors.append(('Others', others_commits))
+    
+    labels, values = zip(*top_authors)
+    
+    # Create pie chart directly from the two lists
+    fig = go.Figure(go.Pie(
+        labels=labels, values=values,
+        textposition='inside',
+        textinfo='percent+label'
+    ))
     
     # Customize layout
-    fig.update_traces(textposition='inside', textinfo='percent+label')
     fig.update_layout(
-        margin=dict(l=10, r=10, t=40, b=10)
+        title='Commits by Author',
+        template='plotly_white',
+        margin=CHART_MARGIN
     )
     
-    # Convert to HTML
-    return fig.to_html(include_plotlyjs='cdn', full_html=False, config={'responsive': True})
+    return render_figure(fig, 'author-distribution-chart')
 
 def generate_file_types_chart(file_stats):
     """Generate a chart showing distribution of file types"""
@@ -838,14 +1217,23 @@ def generate_file_types_chart(file_stats):
     if not extensions:
         return "<p>No file data available</p>"
     
-    # Prepare data
-    df = pd.DataFrame(extensions)
+    # Limit to top 10 extensions, grouping the rest under "Others"
+    counts = tuple((ext['extension'], ext['count']) for ext in extensions[:10])
+    if len(extensions) > 10:
+        counts += (('Others', sum(ext['count'] for ext in extensions[10:])),)
     
-    # Limit to top 10 extensions
-    if len(df) > 10:
-        others_count = df.iloc[10:]['count'].sum()
-        df = df.iloc[:10]
-        df = pd.concat([df, pd.DataFrame({'extension': ['Others'], 'count': [others_count]})])
+    return _render_file_types_chart(counts)
+
+@functools.lru_cache(maxsize=32)
+def _render_file_types_chart(counts):
+    """
+    Render the file types bar chart for (extension, count) pairs
+    
+    Cached by the counts themselves: the distribution rarely changes between
+    commits, so most new reports reuse the fragment instead of building and
+    serializing a new figure.
+    """
+    df = pd.DataFrame(list(counts), columns=['extension', 'count'])
     
     # Create horizontal bar chart
     fig = px.bar(df, x='count', y='extension', orientation='h',
@@ -857,9 +1245,8 @@ def generate_file_types_chart(file_stats):
     
     # Customize layout
     fig.update_layout(
-        margin=dict(l=10, r=10, t=40, b=10),
+        margin=CHART_MARGIN,
         yaxis=dict(categoryorder='total ascending')
     )
     
-    # Convert to HTML
-    return fig.to_html(include_plotlyjs='cdn', full_html=False, config={'responsive': True}) 
\ No newline at end of file
+    return render_figure(fig, 'file-types-chart') 
\ No newline at end of file
@@ -1,6 +1,16 @@
+import functools
+import hashlib
+import json
+import os
 from typing import List, Dict, Any, Literal
+import pydantic
 from pydantic import BaseModel, Field
 
+__all__ = ["PluginManifest", "load_manifest", "is_manifest_trusted", "mark_manifest_validated"]
+
+# Sidecar file recording the manifest.json state that last passed validation
+VALIDATED_MARKER = ".manifest.validated"
+
 
 class PluginManifest(BaseModel):
     """Schema for a plugin's manifest.json file."""
@@ -27,4 +37,55 @@ class PluginManifest(BaseModel):
     # V2 Fields - Simple and focused
     schema_version: Literal["1.0", "2.0"] = "1.0"
     supports_page_mode: bool = False  # Simple flag to enable page mode
-    page_title: str | None = None     # Optional custom page title 
\ No newline at end of file
+    page_title: str | None = None     # Optional custom page title 
+
+
+@functools.lru_cache(maxsize=1)
+def _schema_fingerprint() -> str:
+    """Identify the PluginManifest schema, so markers from an older schema are not trusted."""
+    schema = json.dumps(PluginManifest.model_json_schema(), sort_keys=True)
+    return hashlib.sha256(f"{pydantic.VERSION}:{schema}".encode()).hexdigest()[:16]
+
+
+def _manifest_stamp(manifest_path: str) -> str:
+    stat = os.stat(manifest_path)
+    return f"{_schema_fingerprint()}:{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def is_manifest_trusted(manifest_path: str) -> bool:
+    """Return True if manifest_path is unchanged since it last passed validation against this schema."""
+    marker_path = os.path.join(os.path.dirname(manifest_path), VALIDATED_MARKER)
+    try:
+        with open(marker_path) as f:
+            return f.read() == _manifest_stamp(manifest_path)
+    except OSError:
+        return False
+
+
+def mark_manifest_validated(manifest_path: str) -> None:
+    """Record that manifest_path, as it is now on disk, is known to be valid."""
+    marker_path = os.path.join(os.path.dirname(manifest_path), VALIDATED_MARKER)
+    try:
+        with open(marker_path, "w") as f:
+            f.write(_manifest_stamp(manifest_path))
+    except OSError:
+        pass  # Read-only plugin directory; the manifest is simply validated again next time
+
+
+def load_manifest(manifest_path: str) -> PluginManifest:
+    """
+    Load a manifest.json, validating it only if it changed since it last passed.
+
+    Unchanged manifests are trusted and built with model_construct, which
+    skips validation. Raises pydantic.ValidationError for an invalid manifest.
+    """
+    trusted = is_manifest_trusted(manifest_path)
+    with open(manifest_path, "rb") as f:
+        raw = f.read()
+
+    if trusted:
+        return PluginManifest.model_construct(**json.loads(raw))
+
+    manifest = PluginManifest.model_validate_json(raw)
+    mark_manifest_validated(manifest_path)
+    return manifest
@@ -16,36 +16,51 @@ class PluginRegistry:
     """
     def __init__(self):
         self.plugins = {}
-        self.hook_registry = defaultdict(list)
+        # hook name -> tuple of (plugin_id, callback, predicate); tuples are
+        # replaced, never mutated, so invoke_hook can iterate without copying
+        self.hook_registry = defaultdict(tuple)
+        # Bumped whenever plugins or their settings change, so views can cache
+        self.generation = 0
         
     def register_plugin(self, plugin_id, plugin_instance):
         """Register a plugin in the registry"""
         self.plugins[plugin_id] = plugin_instance
+        self.generation += 1
         logger.info(f"Registered plugin: {plugin_id}")
+    
+    def mark_changed(self):
+        """Record a change to plugin settings"""
+        self.generation += 1
+        
+    def register_hook(self, hook_name, plugin_id, callback, predicate=None):
+        """
+        Register a hook callback for a specific plugin
         
-    def register_hook(self, hook_name, plugin_id, callback):
-        """Register a hook callback for a specific plugin"""
-        self.hook_registry[hook_name].append({
-            'plugin_id': plugin_id,
-            'callback': callback
-        })
+        If predicate is given, it receives the file path of each invocation
+        (the first positional argument or the file_path keyword), and the
+        callback is skipped when it returns False.
+        """
+        self.hook_registry[hook_name] += ((plugin_id, callback, predicate),)
         logger.info(f"Registered hook '{hook_name}' for plugin '{plugin_id}'")
         
     def invoke_hook(self, hook_name, *args, **kwargs):
         """Invoke all callbacks registered for a hook"""
         results = []
-        for handler in self.hook_registry.get(hook_name, []):
+        file_path = args[0] if args else kwargs.get('file_path')
+        for plugin_id, callback, predicate in self.hook_registry.get(hook_name, ()):
+            if predicate is not None and isinstance(file_path, str) and not predicate(file_path):
+                continue
             try:
-                result = handler['callback'](*args, **kwargs)
+                result = callback(*args, **kwargs)
                 results.append({
-                    'plugin_id': handler['plugin_id'],
+                    'plugin_id': plugin_id,
                     'result': result,
                     'success': True
                 })
             except Exception as e:
-                logger.error(f"Error invoking hook '{hook_name}' for plugin '{handler['plugin_id']}': {e}")
+                logger.error(f"Error invoking hook '{hook_name}' for plugin '{plugin_id}': {e}")
                 results.append({
-                    'plugin_id': handler['plugin_id'],
+                    'plugin_id': plugin_id,
                     'error': str(e),
                     'success': False
                 })
@@ -59,9 +74,20 @@ class PluginRegistry:
         """Get all registered plugins"""
         return self.plugins
 
+def extension_filter(*extensions):
+    """Return a hook predicate accepting file paths that end with one of extensions"""
+    return lambda file_path: file_path.endswith(extensions)
+
 class BackendPlugin:
     """Base class for all backend plugins"""
     
+    # Hook name -> predicate on the file path, passed to register_hook
+    hook_filters = {}
+    
+    # When True, on_file_processor receives the file as an open binary file object
+    # instead of its decoded text, so large files need not be read into memory
+    wants_file_stream = False
+    
     def __init__(self, plugin_id, manifest, registry):
         self.plugin_id = plugin_id
         self.manifest = manifest
@@ -75,7 +101,8 @@ class BackendPlugin:
                 self.registry.register_hook(
                     hook_name,
                     self.plugin_id,
-                    getattr(self, f"on_{hook_name}")
+                    getattr(self, f"on_{hook_name}"),
+                    self.hook_filters.get(hook_name)
                 )
     
     def activate(self):
@@ -95,9 +122,12 @@ class BackendPlugin:
         if 'settings' not in self.manifest:
             self.manifest['settings'] = {}
         self.manifest['settings'].update(settings)
+        if self.registry is not None:
+            self.registry.mark_changed()
 
 # Available hooks
 HOOK_FILE_PROCESSOR = "file_processor"     # Process file content
+HOOK_FILE_PROCESSOR_BATCH = "file_processor_batch"  # Process a list of (path, content) pairs
 HOOK_QUERY_HANDLER = "query_handler"       # Handle user queries
 HOOK_STARTUP = "startup"                   # Called on application startup
 HOOK_SHUTDOWN = "shutdown"                 # Called before application shutdown
@@ -6,6 +6,13 @@ from flask import render_template, request, jsonify, Blueprint, current_app, abo
 import os
 import json
 import logging
+from .models import is_manifest_trusted, mark_manifest_validated
+
+# orjson is optional; the stdlib json module is used when it is missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Setup logging
 logger = logging.getLogger("plugin_config")
@@ -13,11 +20,46 @@ logger = logging.getLogger("plugin_config")
 # Create Blueprint for plugin configuration
 plugin_config_bp = Blueprint('plugin_config', __name__)
 
+# Plugin list shown by index(), kept while the registry generation is unchanged
+_plugin_list_cache = {}
+
+# Stand-in manifest for backend plugins without one (read-only)
+_EMPTY = {}
+
+def _loads_manifest(data):
+    """Parse manifest.json bytes"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _dumps_manifest(manifest_data):
+    """
+    Serialize a manifest to UTF-8 bytes, indented by two spaces
+    
+    Keys keep their order, and both codecs produce the same layout
+    (orjson only supports two-space indentation).
+    """
+    if orjson is not None:
+        return orjson.dumps(manifest_data, option=orjson.OPT_INDENT_2)
+    return json.dumps(manifest_data, indent=2, ensure_ascii=False).encode('utf-8')
+
+def _registry_generation():
+    """Return a key identifying the current plugin state, or None if it cannot be tracked"""
+    registry = getattr(current_app.plugin_manager, 'registry', None)
+    if registry is None:
+        return None
+    return (id(registry), registry.generation)
+
 @plugin_config_bp.route('/')
 def index():
     """Show list of installed plugins with configuration options"""
     if not hasattr(current_app, 'plugin_manager'):
         abort(500, description="Plugin system not initialized")
+    
+    generation = _registry_generation()
+    if generation is not None and _plugin_list_cache.get('generation') == generation:
+        return render_template('plugin_config.html',
+                              plugins=_plugin_list_cache['plugins'])
         
     # Get all plugins (UI and backend)
     ui_plugins = {pid: p['manifest'] for pid, p in current_app.plugin_manager.plugins.items()}
@@ -46,21 +88,26 @@ def index():
             settings = plugin.get_settings()
         else:
             settings = {}
-            
+        
+        # Look the manifest up once instead of once per field
+        manifest = getattr(plugin, 'manifest', _EMPTY)
         all_plugins.append({
             'id': plugin_id,
-            'name': plugin.manifest.get('name', plugin_id) if hasattr(plugin, 'manifest') else plugin_id,
-            'description': plugin.manifest.get('description', '') if hasattr(plugin, 'manifest') else '',
-            'version': plugin.manifest.get('version', '0.0.0') if hasattr(plugin, 'manifest') else '0.0.0',
+            'name': manifest.get('name', plugin_id),
+            'description': manifest.get('description', ''),
+            'version': manifest.get('version', '0.0.0'),
             'type': 'backend',
             'settings': settings,
             'has_settings': bool(settings),
-            'icon': plugin.manifest.get('icon', '🔌') if hasattr(plugin, 'manifest') else '🔌'
+            'icon': manifest.get('icon', '🔌')
         })
     
     # Sort plugins by name
     all_plugins.sort(key=lambda p: p['name'])
     
+    if generation is not None:
+        _plugin_list_cache.update(generation=generation, plugins=all_plugins)
+    
     # Render the template
     return render_template('plugin_config.html', 
                           plugins=all_plugins)
@@ -97,14 +144,15 @@ def plugin_detail(plugin_id):
                 settings = plugin.get_settings()
             else:
                 settings = {}
-                
+            
+            manifest = getattr(plugin, 'manifest', _EMPTY)
             plugin_data = {
                 'id': plugin_id,
-                'name': plugin.manifest.get('name', plugin_id) if hasattr(plugin, 'manifest') else plugin_id,
-                'description': plugin.manifest.get('description', '') if hasattr(plugin, 'manifest') else '',
-                'version': plugin.manifest.get('version', '0.0.0') if hasattr(plugin, 'manifest') else '0.0.0',
+                'name': manifest.get('name', plugin_id),
+                'description': manifest.get('description', ''),
+                'version': manifest.get('version', '0.0.0'),
                 'settings': settings,
-                'icon': plugin.manifest.get('icon', '🔌') if hasattr(plugin, 'manifest') else '🔌'
+                'icon': manifest.get('icon', '🔌')
             }
             plugin_type = 'backend'
     
@@ -156,16 +204,20 @@ def save_plugin_settings(plugin_id):
         try:
             manifest_path = os.path.join(plugin['path'], 'manifest.json')
             if os.path.exists(manifest_path):
-                with open(manifest_path, 'r') as f:
-                    manifest_data = json.load(f)
+                was_trusted = is_manifest_trusted(manifest_path)
+                with open(manifest_path, 'rb') as f:
+                    manifest_data = _loads_manifest(f.read())
                 
                 if 'settings' not in manifest_data:
                     manifest_data['settings'] = {}
                     
                 manifest_data['settings'].update(settings)
                 
-                with open(manifest_path, 'w') as f:
-                    json.dump(manifest_data, f, indent=4)
+                with open(manifest_path, 'wb') as f:
+                    f.write(_dumps_manifest(manifest_data))
+                # Only settings changed, so a manifest that was valid stays valid
+                if was_trusted:
+                    mark_manifest_validated(manifest_path)
                     
                 logger.info(f"Saved settings to manifest.json for plugin {plugin_id}")
         except Exception as e:
@@ -185,6 +237,12 @@ def save_plugin_settings(plugin_id):
     if not updated:
         return jsonify({"success": False, "error": f"Plugin {plugin_id} not found or does not support settings"}), 404
     
+    # Invalidate the cached plugin list; plugins may override update_settings
+    # without calling BackendPlugin.update_settings
+    registry = getattr(current_app.plugin_manager, 'registry', None)
+    if registry is not None:
+        registry.mark_changed()
+    
     if request.is_json:
         return jsonify({"success": True, "message": "Settings saved successfully", "plugin_type": plugin_type})
     else:
@@ -4,11 +4,14 @@ Analyzes Python files and provides information about their structure.
 """
 import ast
 import logging
-from ..plugin_base import BackendPlugin
+from ..plugin_base import BackendPlugin, HOOK_FILE_PROCESSOR, extension_filter
 
 # Setup logging
 logger = logging.getLogger("py_analyzer")
 
+# Statement fields that can hold nested statements (if/try/with/for/while/match blocks)
+BLOCK_FIELDS = ('body', 'orelse', 'finalbody', 'handlers', 'cases')
+
 def create_plugin(plugin_id, manifest, registry):
     """Create the plugin instance"""
     return PythonAnalyzerPlugin(plugin_id, manifest, registry)
@@ -18,6 +21,9 @@ class PythonAnalyzerPlugin(BackendPlugin):
     Python code analyzer plugin
     """
     
+    # Only Python files are dispatched to on_file_processor
+    hook_filters = {HOOK_FILE_PROCESSOR: extension_filter('.py')}
+    
     def __init__(self, plugin_id, manifest, registry):
         super().__init__(plugin_id, manifest, registry)
         
@@ -46,7 +52,11 @@ class PythonAnalyzerPlugin(BackendPlugin):
             functions = []
             classes = []
             
-            for node in ast.walk(tree):
+            # Visit statement blocks only; function bodies and expressions
+            # are not descended into
+            nodes = list(tree.body)
+            while nodes:
+                node = nodes.pop()
                 if isinstance(node, ast.FunctionDef):
                     functions.append({
                         "name": node.name,
@@ -58,6 +68,14 @@ class PythonAnalyzerPlugin(BackendPlugin):
                         "name": node.name,
                         "line": node.lineno
                     })
+                    nodes.extend(node.body)
+                elif not isinstance(node, ast.AsyncFunctionDef):
+                    for field in BLOCK_FIELDS:
+                        nodes.extend(getattr(node, field, ()))
+            
+            # Report in source order
+            functions.sort(key=lambda f: f["line"])
+            classes.sort(key=lambda c: c["line"])
             
             return {
                 "success": True,
@@ -3,21 +3,288 @@ Python UML Analyzer plugin for FIXIT.
 Analyzes Python code and extracts class/method information for UML generation.
 """
 import ast
+import hashlib
+import inspect
 import os
 import logging
 import json
+import multiprocessing
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from typing import Dict, Any, List, Optional
-from ..plugin_base import BackendPlugin
+from ..plugin_base import BackendPlugin, HOOK_FILE_PROCESSOR, extension_filter
 
 # Setup logging
 logger = logging.getLogger("py_uml_analyzer")
 
+# Constant values recorded for class attributes (the former ast.Str/Num/NameConstant)
+LITERAL_TYPES = (str, int, float, complex, bool, type(None))
+
+# Directory scans with at least this many files to parse use a process pool
+PARALLEL_MIN_FILES = 64
+
+# Upper bound on parser processes shared by all scans
+MAX_PARSE_WORKERS = 4
+
+# Shared parser pool, created on first use
+_executor = None
+_executor_lock = threading.Lock()
+
+# Statement fields that can hold nested statements (if/try/with/for/while/match blocks)
+BLOCK_FIELDS = ('body', 'orelse', 'finalbody', 'handlers', 'cases')
+
 def create_plugin(plugin_id, manifest, registry):
     """Create the Python UML Analyzer plugin instance"""
     return PythonUMLAnalyzerPlugin(plugin_id, manifest, registry)
 
+def iter_class_defs(tree):
+    """
+    Yield the class definitions of a module, breadth first
+    
+    Only statement blocks are visited: expressions and function bodies are
+    never descended into, since classes are not looked for there.
+    """
+    queue = deque(tree.body)
+    while queue:
+        node = queue.popleft()
+        if isinstance(node, ast.ClassDef):
+            yield node
+            queue.extend(node.body)
+        elif not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            for field in BLOCK_FIELDS:
+                queue.extend(getattr(node, field, ()))
+
+def parse_classes(file_path, file_content):
+    """
+    Parse Python source and extract class information
+    
+    Args:
+        file_path (str): Path to the file
+        file_content (str or bytes): Content of the file; bytes are decoded
+            by the tokenizer, honouring PEP 263 encoding declarations
+    
+    Returns:
+        list: List of ClassInfo objects
+    """
+    # A class statement needs the "class" keyword somewhere in the source;
+    # the substring search is far cheaper than parsing a file without one
+    # (source encodings are ASCII-compatible, so this holds for bytes too)
+    if (b'class' if isinstance(file_content, bytes) else 'class') not in file_content:
+        return []
+    
+    try:
+        # Parse the Python code
+        tree = ast.parse(file_content, filename=file_path)
+        
+        # Extract class information
+        classes = []
+        
+        for node in iter_class_defs(tree):
+            # Extract base classes
+            bases = []
+            for base in node.bases:
+                if isinstance(base, ast.Name):
+                    bases.append(base.id)
+                elif isinstance(base, ast.Attribute):
+                    bases.append(get_full_attribute_name(base))
+            
+            # Get docstring if available
+            docstring = get_docstring(node)
+            
+            # Create class info
+            class_info = ClassInfo(
+                name=node.name,
+                bases=bases,
+                docstring=docstring,
+                file_path=file_path,
+                line_number=node.lineno
+            )
+            
+            # Extract methods
+            for item in node.body:
+                if isinstance(item, ast.FunctionDef):
+                    # Extract method parameters
+                    params = [arg.arg for arg in item.args.args]
+                    # Remove 'self' from parameters
+                    if params and params[0] == 'self':
+                        params = params[1:]
+                    
+                    # Get method docstring
+                    method_docstring = get_docstring(item)
+                    
+                    method_info = {
+                        "name": item.name,
+                        "params": params,
+                        "docstring": method_docstring,
+                        "line_number": item.lineno,
+                        "visibility": get_visibility(item.name)
+                    }
+                    
+                    class_info.methods.append(method_info)
+                elif isinstance(item, ast.Assign):
+                    # Extract class attributes
+                    for target in item.targets:
+                        if isinstance(target, ast.Name):
+                            # Extract attribute value if it's a simple literal;
+                            # ast.Constant already holds it, no literal_eval needed
+                            value = None
+                            if isinstance(item.value, ast.Constant) and isinstance(item.value.value, LITERAL_TYPES):
+                                value = item.value.value
+                            
+                            attr_info = {
+                                "name": target.id,
+                                "value": value,
+                                "line_number": item.lineno,
+                                "visibility": get_visibility(target.id)
+                            }
+                            
+                            class_info.attributes.append(attr_info)
+            
+            classes.append(class_info)
+        
+        return classes
+    except SyntaxError as e:
+        logger.error(f"Syntax error in {file_path}: {e}")
+        return []
+    except Exception as e:
+        logger.error(f"Error analyzing {file_path}: {e}")
+        return []
+
+def get_docstring(node):
+    """
+    Return the docstring of a class or function node, or None
+    
+    Same result as ast.get_docstring, but single-line docstrings (most of
+    them) skip inspect.cleandoc, whose line handling only matters for
+    several lines.
+    """
+    first = node.body[0]
+    if not (isinstance(first, ast.Expr) and isinstance(first.value, ast.Constant)):
+        return None
+    docstring = first.value.value
+    if not isinstance(docstring, str):
+        return None
+    if '\n' not in docstring:
+        return docstring.expandtabs().lstrip()
+    return inspect.cleandoc(docstring)
+
+def get_visibility(name):
+    """
+    Classify a member name as 'private' (__x), 'protected' (_x) or 'public'
+    
+    Looks at the first two characters by slicing rather than calling
+    startswith twice per member.
+    """
+    if name[:1] != '_':
+        return 'public'
+    return 'private' if name[1:2] == '_' else 'protected'
+
+def get_full_attribute_name(node):
+    """
+    Get the full name of an attribute (e.g., module.Class)
+    
+    Args:
+        node (ast.Attribute): AST node representing an attribute
+    
+    Returns:
+        str: Full attribute name
+    """
+    if isinstance(node, ast.Name):
+        return node.id
+    elif isinstance(node, ast.Attribute):
+        return f"{get_full_attribute_name(node.value)}.{node.attr}"
+    return ""
+
+def iter_python_files(root):
+    """Yield a DirEntry for every .py file below root, without following directory symlinks"""
+    try:
+        entries = os.scandir(root)
+    except OSError as e:
+        # Unreadable directories are skipped, as os.walk did
+        logger.warning(f"Cannot read directory {root}: {e}")
+        return
+    with entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_python_files(entry.path)
+            elif entry.name.endswith('.py'):
+                yield entry
+
+def analyze_file(file_path):
+    """
+    Read and parse one Python file; runs in worker processes for directory scans
+    
+    Returns:
+        tuple: (content sha1, list of ClassInfo objects), or (None, error message)
+    """
+    # Read bytes and let ast.parse decode them, instead of decoding in Python first
+    try:
+        with open(file_path, 'rb') as f:
+            file_content = f.read()
+    except Exception as e:
+        return None, str(e)
+    digest = hashlib.sha1(file_content).hexdigest()
+    return digest, parse_classes(file_path, file_content)
+
+def parse_source(item):
+    """
+    Parse one (file_path, file_content) pair; runs in worker processes for batches
+    
+    Returns:
+        tuple: (content sha1, list of ClassInfo objects)
+    """
+    file_path, file_content = item
+    digest = hashlib.sha1(file_content.encode('utf-8', 'surrogatepass')).hexdigest()
+    return digest, parse_classes(file_path, file_content)
+
+def get_executor():
+    """
+    Return the process pool shared by directory scans, creating it on first use
+    
+    Workers are started with forkserver (or spawn) rather than fork, since the
+    server process runs request threads that a forked child would inherit
+    mid-operation.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+            _executor = ProcessPoolExecutor(
+                max_workers=min(MAX_PARSE_WORKERS, os.cpu_count() or 1),
+                mp_context=context
+            )
+        return _executor
+
+def discard_executor(executor):
+    """Drop a broken shared pool so the next scan starts a fresh one"""
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False)
+
+def map_parallel(func, items):
+    """Apply func to items, in the shared pool when there are enough of them"""
+    if len(items) < PARALLEL_MIN_FILES:
+        return [func(item) for item in items]
+    executor = get_executor()
+    try:
+        return list(executor.map(func, items, chunksize=32))
+    except BrokenProcessPool as e:
+        # A worker died; finish this batch in-process
+        logger.warning(f"Parser pool failed, parsing serially: {e}")
+        discard_executor(executor)
+        return [func(item) for item in items]
+
 class ClassInfo:
     """Class to store information about a Python class"""
+    # One instance per class found in a scan; slots drop the per-instance __dict__
+    __slots__ = ('name', 'bases', 'docstring', 'methods', 'attributes', 'file_path', 'line_number',
+                 '_dict')
+    
     def __init__(self, name, bases=None, docstring=None, file_path=None, line_number=None):
         self.name = name
         self.bases = bases or []
@@ -26,28 +293,47 @@ class ClassInfo:
         self.attributes = []
         self.file_path = file_path
         self.line_number = line_number
+        self._dict = None
     
     def to_dict(self):
-        """Convert to dictionary for JSON serialization"""
-        return {
-            "name": self.name,
-            "bases": self.bases,
-            "docstring": self.docstring,
-            "methods": self.methods,
-            "attributes": self.attributes,
-            "file_path": self.file_path,
-            "line_number": self.line_number
-        }
+        """
+        Convert to dictionary for JSON serialization
+        
+        The dictionary is built once and reused: instances are complete when
+        parse_classes returns them and are not modified afterwards.
+        """
+        if self._dict is None:
+            self._dict = {
+                "name": self.name,
+                "bases": self.bases,
+                "docstring": self.docstring,
+                "methods": self.methods,
+                "attributes": self.attributes,
+                "file_path": self.file_path,
+                "line_number": self.line_number
+            }
+        return self._dict
 
 class PythonUMLAnalyzerPlugin(BackendPlugin):
     """
     Python UML Analyzer plugin for extracting class information for UML diagrams
     """
     
+    # Only Python files are dispatched to on_file_processor
+    hook_filters = {HOOK_FILE_PROCESSOR: extension_filter('.py')}
+    
     def __init__(self, plugin_id, manifest, registry):
         super().__init__(plugin_id, manifest, registry)
         # Store analyzed classes by file path
         self.class_cache = {}
+        # Parsed classes keyed by file path -> (content sha1, classes)
+        self._parse_cache = {}
+        # (st_mtime_ns, st_size) of files analyzed by _analyze_directory
+        self._file_stamps = {}
+        # to_dict() output per file path, rebuilt only when class_cache changes
+        self._class_dicts = {}
+        # Flattened _class_dicts for whole-cache responses; None when stale
+        self._all_class_dicts = None
         
     def activate(self):
         """Called when the plugin is activated"""
@@ -85,8 +371,7 @@ class PythonUMLAnalyzerPlugin(BackendPlugin):
             return {
                 "success": True,
                 "plugin_id": self.plugin_id,
-                "classes": [class_info.to_dict() for file_classes in self.class_cache.values() 
-                           for class_info in file_classes]
+                "classes": self._get_all_class_dicts()
             }
         elif action == 'analyze_directory':
             # Analyze a directory of Python files
@@ -129,15 +414,9 @@ class PythonUMLAnalyzerPlugin(BackendPlugin):
             classes = self._analyze_python_file(file_path, file_content)
             
             # Store in cache
-            self.class_cache[file_path] = classes
+            self._store_classes(file_path, classes)
             
-            return {
-                "success": True,
-                "plugin_id": self.plugin_id,
-                "file_path": file_path,
-                "classes": [class_info.to_dict() for class_info in classes],
-                "class_count": len(classes)
-            }
+            return self._file_result(file_path, classes)
         except Exception as e:
             logger.error(f"Error analyzing file {file_path}: {e}")
             return {
@@ -146,6 +425,74 @@ class PythonUMLAnalyzerPlugin(BackendPlugin):
                 "error": str(e)
             }
     
+    def on_file_processor_batch(self, items, metadata=None):
+        """
+        Process many Python files in one call
+        
+        Files whose content is unchanged reuse their cached classes; the rest
+        are parsed together, in worker processes when there are enough.
+        
+        Args:
+            items (list): (file_path, file_content) pairs
+            metadata (dict, optional): Additional metadata
+            
+        Returns:
+            list: One result per item, as returned by on_file_processor
+        """
+        results = [None] * len(items)
+        pending = []
+        for index, (file_path, file_content) in enumerate(items):
+            if not file_path.endswith('.py'):
+                results[index] = {
+                    "success": True,
+                    "plugin_id": self.plugin_id,
+                    "skipped": True,
+                    "message": "Not a Python file"
+                }
+                continue
+            digest = hashlib.sha1(file_content.encode('utf-8', 'surrogatepass')).hexdigest()
+            cached = self._parse_cache.get(file_path)
+            if cached is not None and cached[0] == digest:
+                self._store_classes(file_path, cached[1])
+                results[index] = self._file_result(file_path, cached[1])
+            else:
+                pending.append(index)
+        
+        # parse_classes logs and skips files it cannot parse, so one bad file
+        # does not fail the batch
+        parsed = map_parallel(parse_source, [tuple(items[index]) for index in pending])
+        for index, (digest, classes) in zip(pending, parsed):
+            file_path = items[index][0]
+            self._parse_cache[file_path] = (digest, classes)
+            self._store_classes(file_path, classes)
+            results[index] = self._file_result(file_path, classes)
+        return results
+    
+    def _file_result(self, file_path, classes):
+        """Build the file_processor response for a file's classes"""
+        return {
+            "success": True,
+            "plugin_id": self.plugin_id,
+            "file_path": file_path,
+            "classes": self._class_dicts[file_path],
+            "class_count": len(classes)
+        }
+    
+    def _store_classes(self, file_path, classes):
+        """Record the classes of a file in class_cache, keeping the dict caches in step"""
+        if self.class_cache.get(file_path) is classes and file_path in self._class_dicts:
+            return
+        self.class_cache[file_path] = classes
+        self._class_dicts[file_path] = [class_info.to_dict() for class_info in classes]
+        self._all_class_dicts = None
+    
+    def _get_all_class_dicts(self):
+        """Return to_dict() output for every cached class, built from the per-file dicts"""
+        if self._all_class_dicts is None:
+            self._all_class_dicts = [class_dict for file_dicts in self._class_dicts.values()
+                                     for class_dict in file_dicts]
+        return self._all_class_dicts
+    
     def _analyze_directory(self, dir_path):
         """
         Recursively analyze all Python files in a directory
@@ -157,36 +504,47 @@ class PythonUMLAnalyzerPlugin(BackendPlugin):
             dict: Analysis results
         """
         try:
-            python_files = []
+            python_file_count = 0
             class_count = 0
             
-            # Walk the directory recursively
-            for root, _, files in os.walk(dir_path):
-                for file in files:
-                    if file.endswith('.py'):
-                        python_files.append(os.path.join(root, file))
-            
-            # Analyze each Python file
-            for file_path in python_files:
+            # Walk the directory recursively; files unchanged since the last
+            # scan are not read again
+            changed_files = []
+            for entry in iter_python_files(dir_path):
+                python_file_count += 1
+                file_path = entry.path
                 try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        file_content = f.read()
-                        
-                    result = self.on_file_processor(file_path, file_content)
-                    if result.get('success') and not result.get('skipped'):
-                        class_count += result.get('class_count', 0)
-                except Exception as e:
+                    stat = entry.stat()
+                except OSError as e:
                     logger.error(f"Error processing file {file_path}: {e}")
+                    continue
+                stamp = (stat.st_mtime_ns, stat.st_size)
+                if self._file_stamps.get(file_path) == stamp and file_path in self.class_cache:
+                    class_count += len(self.class_cache[file_path])
+                else:
+                    changed_files.append((file_path, stamp))
+            
+            # Parsing is CPU-bound, so larger batches are spread over worker processes
+            paths = [file_path for file_path, _ in changed_files]
+            results = map_parallel(analyze_file, paths)
+            
+            for (file_path, stamp), (digest, classes) in zip(changed_files, results):
+                if digest is None:
+                    logger.error(f"Error processing file {file_path}: {classes}")
+                    continue
+                self._store_classes(file_path, classes)
+                self._parse_cache[file_path] = (digest, classes)
+                self._file_stamps[file_path] = stamp
+                class_count += len(classes)
             
             # Return all analyzed classes
             return {
                 "success": True,
                 "plugin_id": self.plugin_id,
                 "directory": dir_path,
-                "python_files": len(python_files),
+                "python_files": python_file_count,
                 "class_count": class_count,
-                "classes": [class_info.to_dict() for file_classes in self.class_cache.values() 
-                           for class_info in file_classes]
+                "classes": self._get_all_class_dicts()
             }
         except Exception as e:
             logger.error(f"Error analyzing directory {dir_path}: {e}")
@@ -200,6 +558,9 @@ class PythonUMLAnalyzerPlugin(BackendPlugin):
         """
         Analyze a Python file and extract class information
         
+        Results are cached per file path and reused while the content hash
+        is unchanged, so unchanged files are not parsed again.
+        
         Args:
             file_path (str): Path to the file
             file_content (str): Content of the file
@@ -207,113 +568,11 @@ class PythonUMLAnalyzerPlugin(BackendPlugin):
         Returns:
             list: List of ClassInfo objects
         """
-        try:
-            # Parse the Python code
-            tree = ast.parse(file_content)
-            
-            # Extract class information
-            classes = []
-            
-            for node in ast.walk(tree):
-                if isinstance(node, ast.ClassDef):
-                    # Extract base classes
-                    bases = []
-                    for base in node.bases:
-                        if isinstance(base, ast.Name):
-                            bases.append(base.id)
-                        elif isinstance(base, ast.Attribute):
-                            bases.append(self._get_full_attribute_name(base))
-                    
-                    # Get docstring if available
-                    docstring = ast.get_docstring(node)
-                    
-                    # Create class info
-                    class_info = ClassInfo(
-                        name=node.name,
-                        bases=bases,
-                        docstring=docstring,
-                        file_path=file_path,
-                        line_number=node.lineno
-                    )
-                    
-                    # Extract methods
-                    for item in node.body:
-                        if isinstance(item, ast.FunctionDef):
-                            # Extract method parameters
-                            params = [arg.arg for arg in item.args.args]
-                            # Remove 'self' from parameters
-                            if params and params[0] == 'self':
-                                params = params[1:]
-                                
-                            # Get method docstring
-                            method_docstring = ast.get_docstring(item)
-                            
-                            # Determine method visibility (private, protected, public)
-                            visibility = 'public'
-                            if item.name.startswith('__'):
-                                visibility = 'private'
-                            elif item.name.startswith('_'):
-                                visibility = 'protected'
-                                
-                            method_info = {
-                                "name": item.name,
-                                "params": params,
-                                "docstring": method_docstring,
-                                "line_number": item.lineno,
-                                "visibility": visibility
-                            }
-                            
-                            class_info.methods.append(method_info)
-                        elif isinstance(item, ast.Assign):
-                            # Extract class attributes
-                            for target in item.targets:
-                                if isinstance(target, ast.Name):
-                                    # Extract attribute value if it's a simple literal
-                                    value = None
-                                    if isinstance(item.value, (ast.Str, ast.Num, ast.NameConstant)):
-                                        try:
-                                            value = ast.literal_eval(item.value)
-                                        except (ValueError, SyntaxError):
-                                            pass
-                                    
-                                    # Determine attribute visibility
-                                    visibility = 'public'
-                                    if target.id.startswith('__'):
-                                        visibility = 'private'
-                                    elif target.id.startswith('_'):
-                                        visibility = 'protected'
-                                        
-                                    attr_info = {
-                                        "name": target.id,
-                                        "value": value,
-                                        "line_number": item.lineno,
-                                        "visibility": visibility
-                                    }
-                                    
-                                    class_info.attributes.append(attr_info)
-                    
-                    classes.append(class_info)
-            
-            return classes
-        except SyntaxError as e:
-            logger.error(f"Syntax error in {file_path}: {e}")
-            return []
-        except Exception as e:
-            logger.error(f"Error analyzing {file_path}: {e}")
-            return []
-    
-    def _get_full_attribute_name(self, node):
-        """
-        Get the full name of an attribute (e.g., module.Class)
+        digest = hashlib.sha1(file_content.encode('utf-8', 'surrogatepass')).hexdigest()
+        cached = self._parse_cache.get(file_path)
+        if cached is not None and cached[0] == digest:
+            return cached[1]
         
-        Args:
-            node (ast.Attribute): AST node representing an attribute
-            
-        Returns:
-            str: Full attribute name
-        """
-        if isinstance(node, ast.Name):
-            return node.id
-        elif isinstance(node, ast.Attribute):
-            return f"{self._get_full_attribute_name(node.value)}.{node.attr}"
-        return ""
+        classes = parse_classes(file_path, file_content)
+        self._parse_cache[file_path] = (digest, classes)
+        return classes
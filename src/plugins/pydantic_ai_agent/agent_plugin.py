@@ -3,41 +3,132 @@ PydanticAI Agent plugin for FIXIT.
 Provides AI-powered code analysis and assistance.
 """
 import os
+import re
+import asyncio
+import hashlib
+import json
 import logging
-import pkg_resources
+import queue
+import threading
+from collections import OrderedDict
 from typing import Dict, Any, List, Optional
 from ..plugin_base import BackendPlugin
 
-# Import PydanticAI
-try:
-    from pydantic_ai import Agent, Tool, RunContext
-    from pydantic import BaseModel
+# Import custom tools
+from .tools import file_tools, code_tools
+from .prompts import system_prompts
+
+# Setup logging
+logger = logging.getLogger("pydantic_ai_plugin")
+
+# Default number of file analyses kept by the response cache
+RESPONSE_CACHE_SIZE = 128
+
+# Language names by file extension, used to word the analysis task
+FILE_TYPES = {
+    '.py': 'Python',
+    '.js': 'JavaScript',
+    '.html': 'HTML',
+    '.css': 'CSS',
+    '.json': 'JSON',
+    '.md': 'Markdown',
+    '.txt': 'Text'
+}
+
+# Most characters of file content sent to the agent in one batched request
+BATCH_MAX_CHARS = 48_000
+
+# Line introducing each file of a batched request, and each file's part of the answer
+FILE_MARKER = "---FILE: {path}---"
+FILE_MARKER_RE = re.compile(r'(?m)^[ \t*#>`]*---FILE: (.+?)---')
+
+# Section headings of a plain text analysis, and the bullets that separate its items
+SECTION_MARKER_RE = re.compile(r'(Issues|Suggestions):')
+BULLET_RE = re.compile(r'(?m)^\s*-\s*|\s-\s+')
+
+# Filled in by _load_pydantic_ai; None until the first activation
+PYDANTIC_AI_AVAILABLE = None
+PYDANTIC_AI_VERSION = None
+Agent = None
+AnalysisResult = None
+# Tool objects built once from TOOL_FUNCTIONS, so their schemas are shared by every agent
+TOOLS = None
+
+def _load_pydantic_ai():
+    """
+    Import PydanticAI on first use, so loading the plugin does not pay for it.
+    Returns whether the package is available.
+    """
+    global PYDANTIC_AI_AVAILABLE, PYDANTIC_AI_VERSION, Agent, AnalysisResult, TOOLS
+    if PYDANTIC_AI_AVAILABLE is not None:
+        return PYDANTIC_AI_AVAILABLE
     
-    # Try to verify version compatibility
-    import pkg_resources
-    installed_version = pkg_resources.get_distribution("pydantic-ai").version
+    try:
+        from pydantic_ai import Agent as agent_class, Tool
+        from pydantic import BaseModel
+        from importlib.metadata import version, PackageNotFoundError
+    except (ImportError, AttributeError) as e:
+        logger.debug(f"PydanticAI import failed: {e}")
+        PYDANTIC_AI_AVAILABLE = False
+        return False
     
-    # Define Pydantic models
+    try:
+        installed_version = version("pydantic-ai")
+    except PackageNotFoundError:
+        PYDANTIC_AI_AVAILABLE = False
+        return False
+    
+    # Define Pydantic models (bound to the module global declared above)
     class AnalysisResult(BaseModel):
         """Result of file analysis by PydanticAI agent"""
         issues: List[Dict[str, Any]]
         suggestions: List[Dict[str, Any]]
         summary: str
-        
-    PYDANTIC_AI_AVAILABLE = True
+    
+    Agent = agent_class
+    TOOLS = [Tool(function, takes_ctx=False) for function in TOOL_FUNCTIONS]
     PYDANTIC_AI_VERSION = installed_version
-except (ImportError, pkg_resources.DistributionNotFound, AttributeError) as e:
-    PYDANTIC_AI_AVAILABLE = False
-    PYDANTIC_AI_VERSION = None
-    # Define a placeholder for when pydantic is not available
-    AnalysisResult = None
+    PYDANTIC_AI_AVAILABLE = True
+    return True
 
-# Import custom tools
-from .tools import file_tools, code_tools
-from .prompts import system_prompts
+# Agents by (model, system prompt), shared by every activation of the plugin
+_agents = {}
+_agents_lock = threading.Lock()
 
-# Setup logging
-logger = logging.getLogger("pydantic_ai_plugin")
+def get_agent(model, system_prompt):
+    """Return the agent for model and system_prompt, building it on first use"""
+    key = (model, system_prompt)
+    with _agents_lock:
+        agent = _agents.get(key)
+        if agent is None:
+            agent = Agent(model=model, system_prompt=system_prompt, tools=TOOLS)
+            _agents[key] = agent
+        return agent
+
+# Plain functions exposed to the agent as tools; their docstrings are the tool descriptions
+def read_file(path: str, offset: int = 0) -> dict:
+    """
+    Read content from a file, at most 256 KiB starting at byte offset.
+    When the result is truncated, call again with a larger offset to read more.
+    """
+    return file_tools.read_file(path, offset=offset)
+
+def list_directory(path: str, pattern: Optional[str] = None, limit: Optional[int] = None) -> dict:
+    """
+    List contents of a directory, directories first, optionally only names matching a glob pattern.
+    At most limit entries are returned (500 by default); total counts all matching entries.
+    """
+    return file_tools.list_directory(path, pattern, limit)
+
+def analyze_syntax(code: str, language: str = "python") -> dict:
+    """Analyze code syntax and structure"""
+    return code_tools.analyze_syntax(code, language)
+
+def suggest_improvements(code: str, language: str = "python") -> dict:
+    """Suggest code improvements"""
+    return code_tools.suggest_improvements(code, language)
+
+TOOL_FUNCTIONS = (read_file, list_directory, analyze_syntax, suggest_improvements)
 
 def create_plugin(plugin_id, manifest, registry):
     """Create the PydanticAI agent plugin instance"""
@@ -51,14 +142,43 @@ class PydanticAIAgentPlugin(BackendPlugin):
     def __init__(self, plugin_id, manifest, registry):
         super().__init__(plugin_id, manifest, registry)
         self.agent = None
+        # The agent is built once by _ensure_agent, in the background or on first use
+        self._agent_lock = threading.Lock()
+        self._agent_failed = False
+        self._warmup_started = False
+        # File analyses keyed by _response_cache_key, least recently used first
+        self._response_cache = OrderedDict()
+        self._response_cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
         
     def activate(self):
-        """Initialize and activate the PydanticAI agent"""
-        if not PYDANTIC_AI_AVAILABLE:
+        """
+        Activate the plugin without building the agent yet
+        
+        Importing PydanticAI and building the agent is slow, so it is done by
+        the on_startup warm-up thread, or by the first request when the
+        lazy_startup setting is enabled.
+        """
+        with self._agent_lock:
+            self.agent = None
+            self._agent_failed = False
+    
+    def _ensure_agent(self):
+        """Build the agent if it has not been built yet; return it, or None if it cannot be built"""
+        with self._agent_lock:
+            if self.agent is None and not self._agent_failed:
+                self.agent = self._build_agent()
+                self._agent_failed = self.agent is None
+            return self.agent
+    
+    def _build_agent(self):
+        """Initialize the PydanticAI agent"""
+        if not _load_pydantic_ai():
             logger.error(f"PydanticAI required features not available. The package may be missing or installed version is incompatible.")
             if PYDANTIC_AI_VERSION:
                 logger.error(f"Installed version: {PYDANTIC_AI_VERSION} may not have all required features.")
-            return
+            return None
             
         settings = self.get_settings()
         
@@ -72,17 +192,12 @@ class PydanticAIAgentPlugin(BackendPlugin):
             
         # Initialize the PydanticAI agent
         try:
-            self.agent = Agent(
-                model=settings.get('model', 'gpt-4'),
-                system_prompt=system_prompts.CODE_ANALYSIS_PROMPT,
-            )
-            
-            # Register tools with the agent using decorators
-            self._register_tools()
-            
+            agent = get_agent(settings.get('model', 'gpt-4'), system_prompts.CODE_ANALYSIS_PROMPT)
             logger.info("PydanticAI agent initialized successfully")
+            return agent
         except Exception as e:
             logger.error(f"Failed to initialize PydanticAI agent: {e}")
+            return None
     
     def get_settings(self):
         """Return plugin settings"""
@@ -97,10 +212,17 @@ class PydanticAIAgentPlugin(BackendPlugin):
     def on_startup(self):
         """Handle application startup"""
         logger.info("PydanticAI Agent plugin started")
+        
+        # The startup hook runs again as later plugins load, so the warm-up starts once
+        lazy_startup = str(self.get_settings().get('lazy_startup', False)).lower() in ('true', 'on', '1')
+        if lazy_startup or self._warmup_started:
+            return
+        self._warmup_started = True
+        threading.Thread(target=self._ensure_agent, name="agent-warmup", daemon=True).start()
     
     def on_query_handler(self, query, context=None):
         """Handle user queries using PydanticAI agent"""
-        if not self.agent:
+        if not self._ensure_agent():
             return {"error": "Agent not initialized", "success": False}
             
         try:
@@ -110,13 +232,20 @@ class PydanticAIAgentPlugin(BackendPlugin):
                 **(context or {})
             }
             
+            cache_key = self._query_cache_key(query, context)
+            cached = self._get_cached_response(cache_key)
+            if cached is not None:
+                return cached
+            
             # Run the agent
             result = self.agent.run_sync(query, deps=run_context)
             
-            return {
+            response = {
                 "response": result.output,
                 "success": True
             }
+            self._store_cached_response(cache_key, response)
+            return response
         except Exception as e:
             logger.error(f"Error running agent query: {e}")
             return {
@@ -124,9 +253,70 @@ class PydanticAIAgentPlugin(BackendPlugin):
                 "success": False
             }
     
+    def on_query_stream(self, query, context=None):
+        """
+        Yield the answer to a query as text deltas, as the model produces them.
+        A cached answer is yielded whole; a completed stream is cached like
+        on_query_handler's answers.
+        """
+        if not self._ensure_agent():
+            raise RuntimeError("Agent not initialized")
+        
+        cache_key = self._query_cache_key(query, context)
+        cached = self._get_cached_response(cache_key)
+        if cached is not None:
+            yield cached["response"]
+            return
+        
+        run_context = {
+            "query": query,
+            **(context or {})
+        }
+        
+        # The WSGI worker is synchronous, so the stream runs as a single task on
+        # its own event loop in a helper thread, and deltas come back over a queue
+        deltas = queue.Queue()
+        stop = threading.Event()
+        
+        def produce():
+            try:
+                asyncio.run(self._stream_query(query, run_context, deltas.put, stop))
+            except BaseException as e:
+                deltas.put(e)
+            else:
+                deltas.put(None)
+        
+        threading.Thread(target=produce, name="agent-stream", daemon=True).start()
+        parts = []
+        try:
+            while True:
+                delta = deltas.get()
+                if delta is None:
+                    break
+                if isinstance(delta, BaseException):
+                    raise delta
+                parts.append(delta)
+                yield delta
+        finally:
+            # A client that disconnects stops the run at the next delta
+            stop.set()
+        
+        self._store_cached_response(cache_key, {
+            "response": "".join(parts),
+            "success": True
+        })
+    
+    async def _stream_query(self, query, run_context, emit, stop):
+        """Pass the text deltas of a streamed agent run to emit until stop is set"""
+        async with self.agent.run_stream(query, deps=run_context) as result:
+            async for delta in result.stream_text(delta=True):
+                if stop.is_set():
+                    break
+                emit(delta)
+    
     def on_file_processor(self, file_path, file_content, metadata=None):
         """Process file content using PydanticAI agent"""
-        if not self.agent:
+        if not self._ensure_agent():
             return {"error": "Agent not initialized", "success": False}
         
         try:
@@ -138,6 +328,12 @@ class PydanticAIAgentPlugin(BackendPlugin):
                 "file_type": self._get_file_type(file_path)
             }
             
+            # The same file content is not sent to the model twice
+            cache_key = self._file_cache_key(file_path, file_content)
+            cached = self._get_cached_response(cache_key)
+            if cached is not None:
+                return cached
+            
             # Create a specific task based on file type
             task = f"Analyze the {file_context['file_type']} file at {file_path} and provide detailed code insights"
             
@@ -148,11 +344,13 @@ class PydanticAIAgentPlugin(BackendPlugin):
             raw_output = result.output
             analysis = self._parse_analysis(raw_output)
             
-            return {
+            response = {
                 "analysis": analysis,
                 "raw_output": raw_output,
                 "success": True
             }
+            self._store_cached_response(cache_key, response)
+            return response
         except Exception as e:
             logger.error(f"Error processing file with agent: {e}")
             return {
@@ -160,47 +358,186 @@ class PydanticAIAgentPlugin(BackendPlugin):
                 "success": False
             }
     
-    def _register_tools(self):
-        """Register tools with the PydanticAI agent"""
-        if not self.agent:
-            return
+    def on_file_processor_batch(self, items, metadata=None):
+        """
+        Analyze many files with as few agent runs as possible
+        
+        Uncached files are packed into shared requests of up to BATCH_MAX_CHARS
+        characters, so the system prompt is sent once per request rather than
+        once per file. Each file is introduced by a FILE_MARKER line, and the
+        answer is split back per file on the same markers.
+        
+        Args:
+            items (list): (file_path, file_content) pairs
+            metadata (dict, optional): Additional metadata
+            
+        Returns:
+            list: One result per item, as returned by on_file_processor
+        """
+        if not self._ensure_agent():
+            return [{"error": "Agent not initialized", "success": False} for _ in items]
+        
+        results = [None] * len(items)
+        batches = []
+        batch = []
+        batch_chars = 0
+        for index, (file_path, file_content) in enumerate(items):
+            cache_key = self._file_cache_key(file_path, file_content)
+            cached = self._get_cached_response(cache_key)
+            if cached is not None:
+                results[index] = cached
+                continue
             
-        # Register tools using the modern decorator approach
-        @self.agent.tool_plain
-        def read_file(path: str) -> dict:
-            """Read content from a file"""
-            return file_tools.read_file(path)
-        
-        @self.agent.tool_plain
-        def list_directory(path: str) -> dict:
-            """List contents of a directory"""
-            return file_tools.list_directory(path)
-        
-        @self.agent.tool_plain
-        def analyze_syntax(code: str, language: str = "python") -> dict:
-            """Analyze code syntax and structure"""
-            return code_tools.analyze_syntax(code, language)
-        
-        @self.agent.tool_plain
-        def suggest_improvements(code: str, language: str = "python") -> dict:
-            """Suggest code improvements"""
-            return code_tools.suggest_improvements(code, language)
+            block_chars = len(file_path) + len(file_content)
+            if batch and batch_chars + block_chars > BATCH_MAX_CHARS:
+                batches.append(batch)
+                batch = []
+                batch_chars = 0
+            batch.append((index, cache_key))
+            batch_chars += block_chars
+        if batch:
+            batches.append(batch)
+        
+        for batch in batches:
+            if len(batch) == 1:
+                # A lone file, or one too large to share a request, is analyzed on its own
+                index = batch[0][0]
+                results[index] = self.on_file_processor(*items[index], metadata=metadata)
+                continue
+            self._process_file_batch(items, batch, metadata, results)
+        return results
+    
+    def _process_file_batch(self, items, batch, metadata, results):
+        """Run the agent once over a batch of files and fill in their results"""
+        blocks = []
+        file_contexts = []
+        for index, _ in batch:
+            file_path, file_content = items[index]
+            blocks.append(f"{FILE_MARKER.format(path=file_path)}\n{file_content}")
+            file_contexts.append({
+                "path": file_path,
+                "content": file_content,
+                "metadata": metadata or {},
+                "file_type": self._get_file_type(file_path)
+            })
+        task = (
+            "Analyze each of the following files and provide detailed code insights. "
+            "Start the analysis of each file with its own ---FILE: <path>--- line.\n\n"
+            + "\n\n".join(blocks)
+        )
+        
+        try:
+            result = self.agent.run_sync(task, deps={"files": file_contexts})
+        except Exception as e:
+            logger.error(f"Error processing file batch with agent: {e}")
+            for index, _ in batch:
+                results[index] = {
+                    "error": str(e),
+                    "success": False
+                }
+            return
+        
+        # Each file's analysis runs from its marker to the next one
+        raw_output = result.output
+        sections = {}
+        markers = list(FILE_MARKER_RE.finditer(raw_output))
+        for i, match in enumerate(markers):
+            end = markers[i + 1].start() if i + 1 < len(markers) else len(raw_output)
+            sections.setdefault(match.group(1).strip(), raw_output[match.end():end].strip())
+        
+        for index, cache_key in batch:
+            file_path, file_content = items[index]
+            section = sections.get(file_path)
+            if section is None:
+                # The answer skipped this file, so it gets a run of its own
+                results[index] = self.on_file_processor(file_path, file_content, metadata=metadata)
+                continue
+            response = {
+                "analysis": self._parse_analysis(section),
+                "raw_output": section,
+                "success": True
+            }
+            self._store_cached_response(cache_key, response)
+            results[index] = response
+    
+    def _response_cache_size(self):
+        """
+        Return how many file analyses may be cached; 0 disables the cache
+        
+        Only deterministic runs (temperature 0) are cached unless the
+        cache_nondeterministic_responses setting is enabled. Settings saved
+        from the configuration form arrive as strings.
+        """
+        settings = self.get_settings()
+        try:
+            max_size = int(settings.get('response_cache_size', RESPONSE_CACHE_SIZE))
+            temperature = float(settings.get('temperature', 0))
+        except (TypeError, ValueError):
+            return 0
+        allow_nondeterministic = str(settings.get('cache_nondeterministic_responses', False)).lower() in ('true', 'on', '1')
+        if temperature > 0 and not allow_nondeterministic:
+            return 0
+        return max(max_size, 0)
+    
+    def _query_cache_key(self, query, context):
+        """
+        Return the response cache key of a query.
+        Queries differing only in case or spacing share a cached answer;
+        the context is part of the key, since it changes the answer.
+        """
+        normalized_query = " ".join(query.casefold().split())
+        return self._response_cache_key(
+            'query', normalized_query, json.dumps(context or {}, sort_keys=True, default=str)
+        )
+    
+    def _file_cache_key(self, file_path, file_content):
+        """Return the response cache key of a file analysis"""
+        content_hash = hashlib.sha256(file_content.encode('utf-8', 'surrogatepass')).hexdigest()
+        return self._response_cache_key('file', file_path, content_hash)
+    
+    def _response_cache_key(self, kind, *parts):
+        """
+        Return the response cache key for a request, or None if it must not be cached
+        
+        The key covers the model, temperature and system prompt, so changing
+        any of them never returns an answer produced under the old settings.
+        """
+        if not self._response_cache_size():
+            return None
+        settings = self.get_settings()
+        key = hashlib.blake2b(digest_size=16)
+        for part in (kind, str(settings.get('model', 'gpt-4')), str(settings.get('temperature', 0)),
+                     system_prompts.CODE_ANALYSIS_PROMPT) + parts:
+            key.update(part.encode('utf-8', 'surrogatepass'))
+            key.update(b'\0')
+        return key.hexdigest()
+    
+    def _get_cached_response(self, cache_key):
+        """Return the cached response for cache_key, or None on a miss"""
+        if cache_key is None:
+            return None
+        with self._response_cache_lock:
+            response = self._response_cache.get(cache_key)
+            if response is None:
+                self.cache_misses += 1
+                return None
+            self._response_cache.move_to_end(cache_key)
+            self.cache_hits += 1
+        return {**response, "cached": True}
+    
+    def _store_cached_response(self, cache_key, response):
+        """Cache a successful response, evicting the least recently used entries"""
+        if cache_key is None:
+            return
+        max_size = self._response_cache_size()
+        with self._response_cache_lock:
+            self._response_cache[cache_key] = response
+            while len(self._response_cache) > max_size:
+                self._response_cache.popitem(last=False)
     
     def _get_file_type(self, file_path):
         """Determine file type from extension"""
-        ext = os.path.splitext(file_path)[1].lower()
-        
-        file_types = {
-            '.py': 'Python',
-            '.js': 'JavaScript',
-            '.html': 'HTML',
-            '.css': 'CSS',
-            '.json': 'JSON',
-            '.md': 'Markdown',
-            '.txt': 'Text'
-        }
-        
-        return file_types.get(ext, 'Unknown')
+        return FILE_TYPES.get(os.path.splitext(file_path)[1].lower(), 'Unknown')
     
     def _parse_analysis(self, output):
         """Parse agent output to extract structured analysis"""
@@ -209,24 +546,16 @@ class PydanticAIAgentPlugin(BackendPlugin):
             if isinstance(output, dict):
                 return output
                 
-            # Attempt to extract structured data from the output
-            # In a real implementation, this would be more robust
-            issues = []
-            suggestions = []
-            summary = output
+            # Each section runs from its marker to the next one; the first occurrence wins
+            sections = {}
+            markers = list(SECTION_MARKER_RE.finditer(output))
+            for i, match in enumerate(markers):
+                end = markers[i + 1].start() if i + 1 < len(markers) else len(output)
+                sections.setdefault(match.group(1), output[match.end():end])
             
-            # Simple parsing logic - in practice would be more robust
-            if "Issues:" in output:
-                issues_section = output.split("Issues:")[1].split("Suggestions:")[0]
-                issues = [{"description": issue.strip()} 
-                         for issue in issues_section.split("-") 
-                         if issue.strip()]
-                
-            if "Suggestions:" in output:
-                suggestions_section = output.split("Suggestions:")[1]
-                suggestions = [{"description": sugg.strip()} 
-                              for sugg in suggestions_section.split("-") 
-                              if sugg.strip()]
+            issues = self._parse_items(sections.get("Issues", ""))
+            suggestions = self._parse_items(sections.get("Suggestions", ""))
+            summary = output
             
             return {
                 "issues": issues,
@@ -236,3 +565,9 @@ class PydanticAIAgentPlugin(BackendPlugin):
         except Exception as e:
             logger.warning(f"Failed to parse analysis: {e}")
             return {"summary": output}
+    
+    def _parse_items(self, section):
+        """Split a section into its bullet items"""
+        return [{"description": item.strip()}
+                for item in BULLET_RE.split(section)
+                if item.strip()]
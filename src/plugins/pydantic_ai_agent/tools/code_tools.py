@@ -2,9 +2,50 @@
 Code analysis tools for the PydanticAI agent
 """
 import ast
+import functools
 import json
+import re
+import sys
 from typing import Optional, Dict, Any, List
 
+# Sources longer than this are parsed every time instead of keeping their trees cached
+PARSE_CACHE_MAX_CHARS = 200_000
+
+def _parse_python(code: str) -> ast.Module:
+    """
+    Parse Python code, cached by its text
+    
+    The agent usually runs analyze_syntax and suggest_improvements on the
+    same code, so the second tool reuses the tree. Trees are never modified.
+    """
+    if len(code) > PARSE_CACHE_MAX_CHARS:
+        return ast.parse(code)
+    return _parse_python_cached(code)
+
+@functools.lru_cache(maxsize=16)
+def _parse_python_cached(code: str) -> ast.Module:
+    """Parse Python code; see _parse_python"""
+    return ast.parse(code)
+
+# One source line with its line break; the parser only breaks lines on \r\n, \r and \n
+LINE_RE = re.compile(r'[^\r\n]*(?:\r\n|\r|\n)|[^\r\n]+\Z')
+
+def _source_segment(lines, node):
+    """
+    Return the source text of node, like ast.get_source_segment
+    
+    Takes the code already split into lines, so it is not split again for
+    every node. Column offsets count UTF-8 bytes.
+    """
+    first, last = node.lineno - 1, node.end_lineno - 1
+    if first == last:
+        return lines[first].encode('utf-8')[node.col_offset:node.end_col_offset].decode('utf-8')
+    return ''.join([
+        lines[first].encode('utf-8')[node.col_offset:].decode('utf-8'),
+        *lines[first + 1:last],
+        lines[last].encode('utf-8')[:node.end_col_offset].decode('utf-8')
+    ])
+
 def analyze_syntax(code: str, language: Optional[str] = "python") -> dict:
     """
     Analyze code syntax and structure
@@ -16,14 +57,14 @@ def analyze_syntax(code: str, language: Optional[str] = "python") -> dict:
     Returns:
         dict: Analysis results
     """
+    analyzer = SYNTAX_ANALYZERS.get(str(language).lower())
+    if analyzer is None:
+        return {
+            "success": False,
+            "error": f"Syntax analysis for {language} not implemented"
+        }
     try:
-        if language.lower() == "python":
-            return _analyze_python_syntax(code)
-        else:
-            return {
-                "success": False,
-                "error": f"Syntax analysis for {language} not implemented"
-            }
+        return analyzer(code)
     except Exception as e:
         return {
             "success": False,
@@ -41,29 +82,14 @@ def suggest_improvements(code: str, language: Optional[str] = "python") -> dict:
     Returns:
         dict: Suggested improvements
     """
+    suggester = IMPROVEMENT_SUGGESTERS.get(str(language).lower())
+    if suggester is None:
+        return {
+            "success": False,
+            "error": f"Improvement suggestions for {language} not implemented"
+        }
     try:
-        if language.lower() == "python":
-            # This would be a more sophisticated analysis in a real implementation
-            # For now, we'll return a simple structure
-            issues = _identify_python_issues(code)
-            
-            return {
-                "success": True,
-                "issues": issues,
-                "suggestions": [
-                    {
-                        "description": issue["suggestion"],
-                        "severity": issue["severity"],
-                        "line": issue["line"]
-                    }
-                    for issue in issues if "suggestion" in issue
-                ]
-            }
-        else:
-            return {
-                "success": False,
-                "error": f"Improvement suggestions for {language} not implemented"
-            }
+        return suggester(code)
     except Exception as e:
         return {
             "success": False,
@@ -73,7 +99,12 @@ def suggest_improvements(code: str, language: Optional[str] = "python") -> dict:
 def _analyze_python_syntax(code: str) -> dict:
     """Analyze Python code syntax"""
     try:
-        tree = ast.parse(code)
+        tree = _parse_python(code)
+        
+        # Decorators and bases are reported as written, sliced from the
+        # source (end positions need Python 3.8+)
+        lines = LINE_RE.findall(code)
+        has_positions = sys.version_info >= (3, 8)
         
         # Extract basic structure information
         functions = []
@@ -87,16 +118,16 @@ def _analyze_python_syntax(code: str) -> dict:
                     "line": node.lineno,
                     "args": [arg.arg for arg in node.args.args],
                     "decorators": [
-                        ast.unparse(d).strip() for d in node.decorator_list
-                    ] if hasattr(ast, 'unparse') else []
+                        _source_segment(lines, d).strip() for d in node.decorator_list
+                    ] if has_positions else []
                 })
             elif isinstance(node, ast.ClassDef):
                 classes.append({
                     "name": node.name,
                     "line": node.lineno,
                     "bases": [
-                        ast.unparse(b).strip() for b in node.bases
-                    ] if hasattr(ast, 'unparse') else []
+                        _source_segment(lines, b).strip() for b in node.bases
+                    ] if has_positions else []
                 })
             elif isinstance(node, ast.Import):
                 for name in node.names:
@@ -142,19 +173,19 @@ def _identify_python_issues(code: str) -> List[Dict[str, Any]]:
     issues = []
     
     try:
-        tree = ast.parse(code)
+        tree = _parse_python(code)
         
         # This would be a more complex analysis in a real implementation
         # Simple example checks:
         
         # Check for overly complex functions (too many lines)
         for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                # Get function end line
-                end_line = 0
-                for child in ast.walk(node):
-                    if hasattr(child, 'lineno'):
-                        end_line = max(end_line, child.lineno)
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                # Get function end line from the parser instead of walking
+                # the function body (Python 3.7 has no end positions)
+                end_line = getattr(node, 'end_lineno', None)
+                if end_line is None:
+                    end_line = max(child.lineno for child in ast.walk(node) if hasattr(child, 'lineno'))
                 
                 # Check function length
                 if end_line - node.lineno > 30:
@@ -172,3 +203,30 @@ def _identify_python_issues(code: str) -> List[Dict[str, Any]]:
     except Exception:
         # If analysis fails, return empty list
         return []
+
+def _suggest_python_improvements(code: str) -> dict:
+    """Suggest improvements for Python code"""
+    # This would be a more sophisticated analysis in a real implementation
+    # For now, we'll return a simple structure
+    issues = _identify_python_issues(code)
+    
+    return {
+        "success": True,
+        "issues": issues,
+        "suggestions": [
+            {
+                "description": issue["suggestion"],
+                "severity": issue["severity"],
+                "line": issue["line"]
+            }
+            for issue in issues if "suggestion" in issue
+        ]
+    }
+
+# Handlers by lowercased language name; other languages are reported as not implemented
+SYNTAX_ANALYZERS = {
+    "python": _analyze_python_syntax
+}
+IMPROVEMENT_SUGGESTERS = {
+    "python": _suggest_python_improvements
+}
@@ -1,75 +1,102 @@
 """
 File-related tools for the PydanticAI agent
 """
+import fnmatch
 import os
 from typing import Optional
 
-def read_file(path: str) -> dict:
+# Default cap on the file content returned to the agent
+READ_MAX_BYTES = 256 * 1024
+
+# Default cap on the directory entries returned to the agent
+LIST_MAX_ENTRIES = 500
+
+def read_file(path: str, max_bytes: int = READ_MAX_BYTES, offset: int = 0) -> dict:
     """
     Read content from a file
     
     Args:
         path: Path to the file to read
+        max_bytes: Most bytes of content to return; longer files are truncated
+        offset: Byte offset to start reading at, to page through long files
         
     Returns:
         dict: File content and metadata
     """
     try:
-        if not os.path.exists(path):
-            return {
-                "success": False,
-                "error": f"File not found: {path}"
-            }
-            
-        with open(path, 'r') as f:
-            content = f.read()
+        st = os.stat(path)
+        offset = max(offset, 0)
+        
+        # Read one byte past the limit to tell whether the file was cut off
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            raw = f.read(max_bytes + 1)
             
         return {
             "success": True,
-            "content": content,
-            "size": os.path.getsize(path),
+            "content": raw[:max_bytes].decode('utf-8', 'replace'),
+            "offset": offset,
+            "truncated": len(raw) > max_bytes,
+            "size": st.st_size,
             "extension": os.path.splitext(path)[1],
             "path": path
         }
+    except FileNotFoundError:
+        return {
+            "success": False,
+            "error": f"File not found: {path}"
+        }
     except Exception as e:
         return {
             "success": False,
             "error": str(e)
         }
 
-def list_directory(path: str) -> dict:
+def list_directory(path: str, pattern: Optional[str] = None, limit: Optional[int] = None) -> dict:
     """
-    List contents of a directory
+    List contents of a directory, directories first, then by name
     
     Args:
         path: Path to the directory
+        pattern: Optional shell-style pattern (e.g. "*.py") entry names must match
+        limit: Most entries to return, LIST_MAX_ENTRIES when not given
         
     Returns:
-        dict: Directory contents
+        dict: Directory contents, with the total number of matching entries
     """
+    if limit is None:
+        limit = LIST_MAX_ENTRIES
     try:
-        if not os.path.exists(path) or not os.path.isdir(path):
-            return {
-                "success": False,
-                "error": f"Directory not found: {path}"
-            }
-            
+        with os.scandir(path) as it:
+            entries = [entry for entry in it
+                       if not pattern or fnmatch.fnmatch(entry.name, pattern)]
+        # DirEntry caches the type from the directory listing, so sorting is
+        # free; only the returned files (for their size) and symlinks need a stat call
+        entries.sort(key=lambda entry: (not entry.is_dir(), entry.name))
+        
         items = []
-        for item in os.listdir(path):
-            item_path = os.path.join(path, item)
+        for entry in entries[:max(limit, 0)]:
+            is_file = entry.is_file()
             items.append({
-                "name": item,
-                "is_dir": os.path.isdir(item_path),
-                "size": os.path.getsize(item_path) if os.path.isfile(item_path) else None,
-                "path": item_path
+                "name": entry.name,
+                "is_dir": entry.is_dir(),
+                "size": entry.stat().st_size if is_file else None,
+                "path": entry.path
             })
             
         return {
             "success": True,
             "items": items,
             "count": len(items),
+            "total": len(entries),
+            "truncated": len(items) < len(entries),
             "path": path
         }
+    except (FileNotFoundError, NotADirectoryError):
+        return {
+            "success": False,
+            "error": f"Directory not found: {path}"
+        }
     except Exception as e:
         return {
             "success": False,
@@ -1,43 +1,161 @@
 """
 Tree plugin for the file explorer.
-Shows the tree structure of the current directory using the 'tree' command.
+Shows the tree structure of the current directory, as 'tree --gitignore' prints it.
+.gitignore files are applied only when the optional pathspec package is installed.
 """
-import subprocess
 import os
+import threading
 
-def execute(path, **kwargs):
-    """
-    Execute the tree command on the given path.
+try:
+    import pathspec
+except ImportError:
+    pathspec = None
+
+BRANCH = '├── '
+LAST_BRANCH = '└── '
+PIPE = '│   '
+SPACE = '    '
+
+# Compiled .gitignore files by directory, with the stat stamp they were read at
+SPEC_CACHE_SIZE = 1024
+_SPEC_CACHE = {}
+_spec_cache_lock = threading.Lock()
+
+def load_gitignore(directory):
+    """Return the compiled .gitignore of directory, or None if it has none"""
+    if pathspec is None:
+        return None
+    gitignore_path = os.path.join(directory, '.gitignore')
+    try:
+        st = os.stat(gitignore_path)
+    except OSError:
+        with _spec_cache_lock:
+            _SPEC_CACHE.pop(directory, None)
+        return None
+    
+    stamp = (st.st_mtime_ns, st.st_size)
+    with _spec_cache_lock:
+        cached = _SPEC_CACHE.get(directory)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
     
-    Args:
-        path (str): The path to show the tree structure for
+    try:
+        with open(gitignore_path, 'r', encoding='utf-8', errors='replace') as f:
+            spec = pathspec.PathSpec.from_lines('gitwildmatch', f)
+    except OSError:
+        return None
+    
+    with _spec_cache_lock:
+        _SPEC_CACHE.pop(directory, None)
+        if len(_SPEC_CACHE) >= SPEC_CACHE_SIZE:
+            # Drop the least recently read entry
+            del _SPEC_CACHE[next(iter(_SPEC_CACHE))]
+        _SPEC_CACHE[directory] = (stamp, spec)
+    return spec
+
+def child_specs(specs, directory):
+    """Return the (base directory, spec) pairs that apply to the entries of directory"""
+    spec = load_gitignore(directory)
+    if spec is None:
+        return specs
+    return specs + ((directory, spec),)
+
+def is_ignored(entry, is_dir, specs):
+    """Check whether any .gitignore above entry matches it"""
+    for base, spec in specs:
+        rel_path = os.path.relpath(entry.path, base).replace(os.sep, '/')
+        if is_dir:
+            rel_path += '/'
+        if spec.match_file(rel_path):
+            return True
+    return False
+
+def list_entries(directory, specs):
+    """Return the visible entries of directory sorted by name, with their is_dir flag"""
+    entries = []
+    with os.scandir(directory) as it:
+        for entry in it:
+            # Hidden files are skipped, as tree does without -a
+            if entry.name.startswith('.'):
+                continue
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if specs and is_ignored(entry, is_dir, specs):
+                continue
+            entries.append((entry, is_dir))
+    entries.sort(key=lambda item: item[0].name)
+    return entries
+
+def iter_tree_lines(path, counts):
+    """
+    Yield the lines of the tree below path, without the summary line.
+    counts['directories'] and counts['files'] are incremented as entries are yielded.
+    """
+    specs = child_specs((), path)
+    yield path
+    # Each frame holds the entries of one directory, the next index and the line prefix
+    stack = [[list_entries(path, specs), 0, '', specs]]
+    while stack:
+        frame = stack[-1]
+        entries, index, prefix, specs = frame
+        if index == len(entries):
+            stack.pop()
+            continue
+        frame[1] += 1
+        
+        entry, is_dir = entries[index]
+        is_last = index == len(entries) - 1
+        line = prefix + (LAST_BRANCH if is_last else BRANCH) + entry.name
+        counts['directories' if is_dir else 'files'] += 1
         
-    Returns:
-        dict: A dictionary containing the result of the tree command
+        if entry.is_symlink():
+            # Symlinks are shown with their target and never descended into
+            try:
+                line += ' -> ' + os.readlink(entry.path)
+            except OSError:
+                pass
+            yield line
+            continue
+        if not is_dir:
+            yield line
+            continue
+        
+        entry_specs = child_specs(specs, entry.path)
+        try:
+            children = list_entries(entry.path, entry_specs)
+        except OSError:
+            yield line + '  [error opening dir]'
+            continue
+        yield line
+        stack.append([children, 0, prefix + (SPACE if is_last else PIPE), entry_specs])
+
+def format_summary(counts):
+    """Format the closing line of the tree, e.g. '1 directory, 2 files'"""
+    directories = counts['directories']
+    files = counts['files']
+    return (f"{directories} director{'y' if directories == 1 else 'ies'}, "
+            f"{files} file{'' if files == 1 else 's'}")
+
+def execute(path, **kwargs):
+    """
+    Build the tree of the current directory with os.scandir.
+    Entries matched by a .gitignore file are left out.
     """
+    counts = {'directories': 0, 'files': 0}
     try:
-        # Run the tree command with --gitignore option
-        result = subprocess.run(
-            ["tree", "--gitignore", path],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        
-        return {
-            "success": True,
-            "output": result.stdout,
-            "title": "Tree Structure"
-        }
-    except subprocess.CalledProcessError as e:
+        lines = list(iter_tree_lines(path, counts))
+    except OSError as e:
         return {
             "success": False,
-            "error": f"Command failed with exit code {e.returncode}",
-            "output": e.stderr
-        }
-    except FileNotFoundError:
-        return {
-            "success": False,
-            "error": "The 'tree' command is not installed on the system",
-            "output": "Please install the tree command: sudo apt-get install tree"
+            "error": f"Cannot read directory: {e}"
         }
+    
+    lines.append('')
+    lines.append(format_summary(counts))
+    return {
+        "success": True,
+        "output": '\n'.join(lines) + '\n',
+        "title": "Tree Structure"
+    }
@@ -4,10 +4,16 @@ Generates UML diagrams from Python code using the Python UML Analyzer plugin.
 """
 import os
 import json
+import base64
 import logging
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import requests
+from requests.adapters import HTTPAdapter
 from urllib.parse import quote
-from string import Template
+from html import escape
+from string import Formatter
 
 # Setup logging
 logger = logging.getLogger("uml_generator")
@@ -15,17 +21,46 @@ logger = logging.getLogger("uml_generator")
 # PlantUML server URL
 PLANTUML_SERVER = "https://www.plantuml.com/plantuml/svg/"
 
+# (connect, read) timeouts in seconds for the analyzer API
+API_TIMEOUT = (3.05, 30)
+
+# Directories analyzed concurrently by generate_batch; within the session's pool size
+BATCH_WORKERS = 8
+
+# PlantUML's URL encoding is base64 over its own alphabet; '=' becomes '0' because
+# PlantUML pads the last 3-byte group with zero bits instead of padding characters
+PLANTUML_ALPHABET = bytes.maketrans(
+    b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/=",
+    b"0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz-_0"
+)
+
+# One session for every request, so connections are reused
+_session = requests.Session()
+_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+_session.mount("https://", _adapter)
+_session.mount("http://", _adapter)
+
 def execute(path, **kwargs):
     """
     Execute the UML generator plugin
     
     Args:
-        path (str): Directory path to generate UML diagrams for
+        path (str or list): Directory path, or list of paths, to generate UML diagrams for
         
     Returns:
         dict: Result of the execution
     """
     try:
+        if isinstance(path, (list, tuple)):
+            return {
+                "success": True,
+                "diagrams": [
+                    {"path": dir_path, "image_url": image_url}
+                    for dir_path, image_url in generate_batch(path)
+                ],
+                "title": "UML Class Diagrams"
+            }
+        
         # Validate path
         if not os.path.exists(path):
             return {
@@ -97,7 +132,7 @@ def analyze_directory(path):
         }
         
         # Make the API request
-        response = requests.post(api_url, json=payload, timeout=30)
+        response = _session.post(api_url, json=payload, timeout=API_TIMEOUT)
         
         # Check if request was successful
         if response.status_code == 200:
@@ -241,35 +276,59 @@ def generate_uml_diagram(plantuml_code):
     
     return image_url
 
-def encode_plantuml(uml_text):
+def generate_diagram_url(path):
     """
-    Encode PlantUML diagram text into a format that can be used in a URL
+    Analyze a directory and return the URL of its class diagram
+    
+    Args:
+        path (str): Directory path to analyze
+        
+    Returns:
+        str: URL to the diagram, or None if the directory has no classes
     """
-    try:
-        plantuml_server = requests.get("https://www.plantuml.com/plantuml/encode", params={"text": uml_text})
-        return plantuml_server.text
-    except Exception as e:
-        logger.error(f"Error encoding PlantUML: {e}")
+    analysis_result = analyze_directory(path)
+    if not analysis_result.get("success", False):
+        logger.warning(f"Could not analyze {path}: {analysis_result.get('error', 'Unknown error')}")
+        return None
+    classes = analysis_result.get("classes", [])
+    if not classes:
         return None
+    return generate_uml_diagram(generate_plantuml_code(classes))
 
-def generate_output_html(plantuml_code, uml_image_url, classes, path):
+def generate_batch(paths):
     """
-    Generate HTML output with the UML diagram
+    Generate the class diagrams of several directories
+    
+    The analyses run concurrently over the shared session; the diagrams
+    themselves are encoded locally, so no request goes to PlantUML.
     
     Args:
-        plantuml_code (str): PlantUML code
-        uml_image_url (str): URL to the UML diagram image
-        classes (list): List of class information dictionaries
-        path (str): Directory path that was analyzed
+        paths (list): Directory paths to analyze
         
     Returns:
-        str: HTML content
+        list: (path, image_url) pairs in input order, image_url being None
+        for directories that could not be analyzed or have no classes
     """
-    class_count = len(classes)
-    file_count = len(set(cls.get('file_path', '') for cls in classes))
+    paths = list(paths)
+    if not paths:
+        return []
+    with ThreadPoolExecutor(max_workers=min(BATCH_WORKERS, len(paths))) as executor:
+        return list(zip(paths, executor.map(generate_diagram_url, paths)))
+
+@lru_cache(maxsize=32)
+def encode_plantuml(uml_text):
+    """
+    Encode PlantUML diagram text into a format that can be used in a URL
     
-    # Use Template with $ placeholders to avoid conflicts with HTML/JS braces
-    template = Template("""
+    This is the encoding the PlantUML server's /encode endpoint returns: the
+    text is deflated without a zlib header, then base64-encoded with
+    PlantUML's alphabet.
+    """
+    deflated = zlib.compress(uml_text.encode('utf-8'), 9)[2:-4]
+    return base64.b64encode(deflated).translate(PLANTUML_ALPHABET).decode('ascii')
+
+# Result page of the plugin, in str.format syntax (braces of the script are doubled)
+OUTPUT_TEMPLATE = """
     <div class="card">
         <div class="card-header">
             <h2 class="card-title">UML Class Diagram</h2>
@@ -277,7 +336,7 @@ def generate_output_html(plantuml_code, uml_image_url, classes, path):
                 <button id="toggle-code-btn" class="btn-gray text-sm">
                     Show PlantUML Code
                 </button>
-                <a href="$uml_image_url" target="_blank" class="btn-blue text-sm">
+                <a href="{uml_image_url}" target="_blank" class="btn-blue text-sm">
                     <svg xmlns="http://www.w3.org/2000/svg" class="h-4 w-4 mr-1" viewBox="0 0 20 20" fill="currentColor">
                         <path d="M11 3a1 1 0 100 2h2.586l-6.293 6.293a1 1 0 101.414 1.414L15 6.414V9a1 1 0 102 0V4a1 1 0 00-1-1h-5z" />
                         <path d="M5 5a2 2 0 00-2 2v8a2 2 0 002 2h8a2 2 0 002-2v-3a1 1 0 10-2 0v3H5V7h3a1 1 0 000-2H5z" />
@@ -294,65 +353,85 @@ def generate_output_html(plantuml_code, uml_image_url, classes, path):
                         <svg xmlns="http://www.w3.org/2000/svg" class="h-4 w-4 mr-1" viewBox="0 0 20 20" fill="currentColor">
                             <path d="M2 6a2 2 0 012-2h5l2 2h5a2 2 0 012 2v6a2 2 0 01-2 2H4a2 2 0 01-2-2V6z" />
                         </svg>
-                        <span>Directory: $path</span>
+                        <span>Directory: {path}</span>
                     </div>
                     <div class="badge-secondary flex items-center">
                         <svg xmlns="http://www.w3.org/2000/svg" class="h-4 w-4 mr-1" viewBox="0 0 20 20" fill="currentColor">
                             <path fill-rule="evenodd" d="M4 4a2 2 0 012-2h4.586A2 2 0 0112 2.586L15.414 6A2 2 0 0116 7.414V16a2 2 0 01-2 2H6a2 2 0 01-2-2V4zm2 6a1 1 0 011-1h6a1 1 0 110 2H7a1 1 0 01-1-1zm1 3a1 1 0 100 2h6a1 1 0 100-2H7z" clip-rule="evenodd" />
                         </svg>
-                        <span>Files: $file_count</span>
+                        <span>Files: {file_count}</span>
                     </div>
                     <div class="badge-secondary flex items-center">
                         <svg xmlns="http://www.w3.org/2000/svg" class="h-4 w-4 mr-1" viewBox="0 0 20 20" fill="currentColor">
                             <path d="M9 4.804A7.968 7.968 0 005.5 4c-1.255 0-2.443.29-3.5.804v10A7.969 7.969 0 015.5 14c1.669 0 3.218.51 4.5 1.385A7.962 7.962 0 0114.5 14c1.255 0 2.443.29 3.5.804v-10A7.968 7.968 0 0014.5 4c-1.255 0-2.443.29-3.5.804V12a1 1 0 11-2 0V4.804z" />
                         </svg>
-                        <span>Classes: $class_count</span>
+                        <span>Classes: {class_count}</span>
                     </div>
                 </div>
             </div>
             
             <div class="uml-diagram-container p-4 overflow-auto text-center">
-                <img src="$uml_image_url" alt="UML Diagram" class="mx-auto">
+                <img src="{uml_image_url}" alt="UML Diagram" class="mx-auto">
             </div>
             
             <div id="plantuml-code" class="hidden">
                 <div class="border-t border-gray-200 dark:border-gray-700 mt-4"></div>
                 <div class="p-4">
                     <h3 class="font-medium mb-2 text-gray-800 dark:text-gray-200">PlantUML Code</h3>
-                    <pre class="bg-gray-100 dark:bg-gray-800 p-4 rounded-md overflow-x-auto"><code>$plantuml_code</code></pre>
+                    <pre class="bg-gray-100 dark:bg-gray-800 p-4 rounded-md overflow-x-auto"><code>{plantuml_code}</code></pre>
                 </div>
             </div>
         </div>
     </div>
 
     <script>
-        document.addEventListener('DOMContentLoaded', function() {
+        document.addEventListener('DOMContentLoaded', function() {{
             const toggleBtn = document.getElementById('toggle-code-btn');
             const codeBlock = document.getElementById('plantuml-code');
             
-            toggleBtn.addEventListener('click', function() {
-                if (codeBlock.classList.contains('hidden')) {
+            toggleBtn.addEventListener('click', function() {{
+                if (codeBlock.classList.contains('hidden')) {{
                     codeBlock.classList.remove('hidden');
                     toggleBtn.textContent = 'Hide PlantUML Code';
-                } else {
+                }} else {{
                     codeBlock.classList.add('hidden');
                     toggleBtn.textContent = 'Show PlantUML Code';
-                }
-            });
-        });
+                }}
+            }});
+        }});
     </script>
-    """)
+    """
+
+# The template split once into (literal, field name) parts, so rendering only joins strings
+OUTPUT_PARTS = tuple(Formatter().parse(OUTPUT_TEMPLATE))
+
+def generate_output_html(plantuml_code, uml_image_url, classes, path):
+    """
+    Generate HTML output with the UML diagram
     
-    # Substitute values into the template
-    output_html = template.substitute(
-        uml_image_url=uml_image_url,
-        path=path,
-        file_count=file_count,
-        class_count=class_count,
-        plantuml_code=plantuml_code
-    )
+    Args:
+        plantuml_code (str): PlantUML code
+        uml_image_url (str): URL to the UML diagram image
+        classes (list): List of class information dictionaries
+        path (str): Directory path that was analyzed
+        
+    Returns:
+        str: HTML content
+    """
+    class_count = len(classes)
+    file_count = len(set(cls.get('file_path', '') for cls in classes))
     
-    return output_html
+    values = {
+        'uml_image_url': escape(uml_image_url),
+        'path': escape(path),
+        'file_count': file_count,
+        'class_count': class_count,
+        'plantuml_code': escape(plantuml_code)
+    }
+    return ''.join(
+        literal + (str(values[name]) if name else '')
+        for literal, name, _, _ in OUTPUT_PARTS
+    )
 
 def process_file(path, **kwargs):
     """
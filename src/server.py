@@ -1,16 +1,21 @@
 """
 Updated app.py file to integrate the enhancements.
 """
-from flask import Flask, render_template, request, send_file, redirect, url_for, abort, jsonify
+from flask import Flask, render_template, request, send_file, redirect, url_for, abort, jsonify, Response, stream_with_context
 import os
+import json
 import datetime
 import io
 import zipfile
 import logging
 import tempfile
+from functools import lru_cache
+from itertools import accumulate
 from .plugins import PluginManager
 from .app_extensions import setup_enhancements
 from .api_models import QueryRequest, ProcessRequest
+from .paths import resolve_path
+from .json_provider import OrjsonProvider
 from pydantic import ValidationError
 
 # Setup logging
@@ -19,10 +24,20 @@ logger = logging.getLogger("flask_file_explorer")
 
 # Create Flask application
 app = Flask(__name__, static_folder='static')
+if OrjsonProvider is not None:
+    app.json = OrjsonProvider(app)
+
+# Request bodies are small JSON documents (queries, path lists); larger ones get 413
+# before they are parsed. Overridable through the config passed to create_app
+app.config['MAX_CONTENT_LENGTH'] = 4 * 1024 * 1024
 
 # Default plugin directory
 PLUGIN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "plugins")
 
+# Largest file /api/plugins/<id>/process reads into memory for a plugin;
+# overridden by the PLUGIN_MAX_INPUT_BYTES config value, 0 disables the limit
+PLUGIN_MAX_INPUT_BYTES = 64 * 1024 * 1024
+
 def create_app(config=None):
     """
     Create and configure the Flask application
@@ -54,31 +69,89 @@ def create_app(config=None):
     
     return app
 
-def get_file_info(base_dir, path, name):
-    """Get file information"""
-    # Ensure base_dir is used correctly
-    full_path = os.path.abspath(os.path.join(base_dir, path, name))
-    # Check if path is within base_dir (security check)
-    if not full_path.startswith(os.path.abspath(base_dir)):
-        logger.warning(f"Attempt to access restricted path: {full_path}")
-        return None # Or raise an error
+@lru_cache(maxsize=4096)
+def format_mtime(seconds):
+    """
+    Format a modification time in whole seconds, as the explorer displays it.
+    Files changed in the same second share the string, so most lookups hit.
+    """
+    return datetime.datetime.fromtimestamp(seconds).strftime('%Y-%m-%d %H:%M:%S')
 
+def get_entry_info(entry, path, is_dir):
+    """
+    Get file or directory information from a DirEntry
+    
+    DirEntry.stat() follows symlinks like os.stat and is cached on the entry,
+    so each listed item costs a single stat call.
+    """
     try:
-        stat_info = os.stat(full_path)
-        modified = datetime.datetime.fromtimestamp(stat_info.st_mtime)
-        
-        return {
-            'name': name,
-            'path': os.path.join(path, name) if path else name,
-            'size': stat_info.st_size,
-            'modified': modified.strftime('%Y-%m-%d %H:%M:%S')
-        }
-    except FileNotFoundError:
-        logger.error(f"File not found during get_file_info: {full_path}")
-        return None
+        stat_info = entry.stat()
     except Exception as e:
-        logger.error(f"Error getting file info for {full_path}: {e}")
+        logger.error(f"Error getting {'directory' if is_dir else 'file'} info for {entry.path}: {e}")
         return None
+    
+    info = {
+        'name': entry.name,
+        'path': os.path.join(path, entry.name) if path else entry.name,
+        'modified': format_mtime(stat_info.st_mtime_ns // 1_000_000_000)
+    }
+    if not is_dir:
+        info['size'] = stat_info.st_size
+    return info
+
+class ZipStreamBuffer(io.RawIOBase):
+    """Write-only file object collecting the bytes a ZipFile writes until they are drained"""
+    
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+    
+    def writable(self):
+        return True
+    
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+    
+    def drain(self):
+        """Return and forget everything written since the last drain"""
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+# Size of the reads copying a file into a streamed ZIP archive
+ZIP_COPY_CHUNK = 1024 * 1024
+
+# Already-compressed formats, stored as they are since deflating them again gains nothing
+ZIP_STORED_EXTENSIONS = frozenset((
+    '.zip', '.gz', '.tgz', '.bz2', '.xz', '.zst', '.7z', '.rar', '.jar', '.whl',
+    '.png', '.jpg', '.jpeg', '.gif', '.webp', '.mp3', '.mp4', '.m4a', '.mkv',
+    '.mov', '.webm', '.ogg', '.pdf', '.docx', '.xlsx', '.pptx', '.epub'
+))
+
+def write_zip_entry(zipf, buffer, file_path, arcname):
+    """
+    Add a file to a ZipFile writing into buffer, yielding the archive bytes
+    produced after each chunk, so large files are never held in memory whole.
+    """
+    try:
+        zinfo = zipfile.ZipInfo.from_file(file_path, arcname)
+        if os.path.splitext(file_path)[1].lower() in ZIP_STORED_EXTENSIONS:
+            zinfo.compress_type = zipfile.ZIP_STORED
+        else:
+            zinfo.compress_type = zipf.compression
+        with open(file_path, "rb") as src, zipf.open(zinfo, "w") as dest:
+            for chunk in iter(lambda: src.read(ZIP_COPY_CHUNK), b""):
+                dest.write(chunk)
+                data = buffer.drain()
+                if data:
+                    yield data
+    except OSError as e:
+        # The response has already started, so the file is left out rather than failing it
+        logger.error(f"Error adding {file_path} to ZIP archive: {e}")
+    data = buffer.drain()
+    if data:
+        yield data
 
 @app.route('/')
 def index():
@@ -104,19 +177,20 @@ def explore(path=''):
         abort(500, description="Application base directory not configured.")
         
     # Convert the path to absolute path relative to configured BASE_DIR
-    abs_path = os.path.abspath(os.path.join(base_dir, path))
+    abs_path = resolve_path(base_dir, path)
     
     # Security check to prevent directory traversal attacks
-    if not abs_path.startswith(os.path.abspath(base_dir)):
+    if abs_path is None:
         abort(403)  # Forbidden
     
     # Check if path is a file, if so, download it
     if os.path.isfile(abs_path):
         return send_file(abs_path, as_attachment=True)
     
-    # Get list of files and directories
+    # Get list of files and directories; the entries carry their type from the listing
     try:
-        items = os.listdir(abs_path)
+        with os.scandir(abs_path) as it:
+            entries = list(it)
     except PermissionError:
         abort(403)  # Forbidden
     except FileNotFoundError:
@@ -133,29 +207,23 @@ def explore(path=''):
     dirs = []
     files = []
     
-    for item in items:
+    for entry in entries:
         # Apply search filter
-        if search and search not in item.lower():
+        if search and search not in entry.name.lower():
+            continue
+        
+        # Symlinks to directories are listed as directories, as os.path.isdir did
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+        info = get_entry_info(entry, path, is_dir)
+        if info is None:
             continue
-            
-        item_path = os.path.join(abs_path, item)
-        if os.path.isdir(item_path):
-            try:
-                modified_time = os.path.getmtime(item_path)
-                dirs.append({
-                    'name': item,
-                    'path': os.path.join(path, item) if path else item,
-                    'modified': datetime.datetime.fromtimestamp(modified_time).strftime('%Y-%m-%d %H:%M:%S')
-                })
-            except Exception as e:
-                 logger.error(f"Error getting directory info for {item_path}: {e}")
+        if is_dir:
+            dirs.append(info)
         else:
-            # Pass the configured base_dir to get_file_info
-            file_info = get_file_info(base_dir, path, item)
-            if file_info:
-                 files.append(file_info)
-            else:
-                 logger.warning(f"Could not get file info for: {item}")
+            files.append(info)
     
     # Sort directories and files
     if sort_by == 'name':
@@ -201,10 +269,10 @@ def execute_plugin(plugin_id):
         return jsonify({"success": False, "error": "Application base directory not configured."}), 500
         
     path = request.args.get('path', '')
-    abs_path = os.path.abspath(os.path.join(base_dir, path))
+    abs_path = resolve_path(base_dir, path)
     
     # Security check to prevent directory traversal attacks
-    if not abs_path.startswith(os.path.abspath(base_dir)):
+    if abs_path is None:
         return jsonify({
             "success": False,
             "error": "Invalid path"
@@ -227,6 +295,25 @@ def execute_plugin(plugin_id):
     
     return jsonify(result)
 
+def sse_event(data, event=None):
+    """Format one Server-Sent Event with a JSON payload"""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+def sse_query_events(plugin, query, context):
+    """
+    Yield a plugin's streamed answer as Server-Sent Events: one message per
+    text delta, then a 'done' event, or an 'error' event if the run fails.
+    """
+    try:
+        for delta in plugin.on_query_stream(query, context=context):
+            yield sse_event({"delta": delta})
+    except Exception as e:
+        logger.error(f"Error streaming query for plugin {plugin.plugin_id}: {e}")
+        yield sse_event({"error": str(e), "success": False}, event='error')
+        return
+    yield sse_event({"success": True}, event='done')
+
 # API endpoints for backend plugins
 @app.route('/api/plugins/<plugin_id>/query', methods=['POST'])
 def plugin_query(plugin_id):
@@ -250,6 +337,18 @@ def plugin_query(plugin_id):
     # Enrich context with base_dir
     context = {**payload.context, "base_dir": app.config.get('BASE_DIR')}
 
+    # Clients accepting Server-Sent Events get the answer as it is generated
+    plugin = app.plugin_manager.registry.get_plugin(plugin_id)
+    wants_stream = request.accept_mimetypes.best_match(
+        ['application/json', 'text/event-stream']
+    ) == 'text/event-stream'
+    if wants_stream and hasattr(plugin, 'on_query_stream'):
+        return Response(
+            stream_with_context(sse_query_events(plugin, payload.query, context)),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+
     # Execute the plugin using the query_handler hook
     result = app.plugin_manager.execute_plugin(
         plugin_id,
@@ -287,14 +386,25 @@ def plugin_process_file(plugin_id):
         logger.error("BASE_DIR is not configured in the application.")
         return jsonify({"error": "Application base directory not configured."}), 500
 
-    abs_path = os.path.abspath(os.path.join(base_dir, file_path))
-    if not abs_path.startswith(os.path.abspath(base_dir)):
+    abs_path = resolve_path(base_dir, file_path)
+    if abs_path is None:
         return jsonify({"error": "Invalid path"}), 403
 
     if not os.path.exists(abs_path):
         return jsonify({"error": "File not found"}), 404
 
     try:
+        # Streaming plugins are called directly with their own file object;
+        # the hook is broadcast to every plugin, which could not share one
+        plugin_instance = app.plugin_manager.registry.get_plugin(plugin_id)
+        if getattr(plugin_instance, 'wants_file_stream', False) and hasattr(plugin_instance, 'on_file_processor'):
+            with open(abs_path, 'rb') as f:
+                return jsonify(plugin_instance.on_file_processor(abs_path, f, payload.metadata))
+
+        max_bytes = app.config.get('PLUGIN_MAX_INPUT_BYTES', PLUGIN_MAX_INPUT_BYTES)
+        if max_bytes and os.path.getsize(abs_path) > max_bytes:
+            return jsonify({"error": f"File is larger than the {max_bytes} byte limit", "success": False}), 413
+
         with open(abs_path, 'r') as f:
             content = f.read()
 
@@ -313,7 +423,6 @@ def plugin_process_file(plugin_id):
             and result.get('error')
             and 'did not respond to hook' in result.get('error')
         ):
-            plugin_instance = app.plugin_manager.registry.get_plugin(plugin_id)
             if hasattr(plugin_instance, 'on_file_processor'):
                 direct_result = plugin_instance.on_file_processor(
                     abs_path, content, payload.metadata
@@ -364,27 +473,36 @@ def download_selected():
     if not isinstance(paths, list) or not paths:
         return jsonify({"error": "No paths provided"}), 400
 
-    memory_file = io.BytesIO()
-    with zipfile.ZipFile(memory_file, "w", zipfile.ZIP_DEFLATED) as zipf:
-        for rel_path in paths:
-            abs_path = os.path.abspath(os.path.join(base_dir, rel_path))
-            if not abs_path.startswith(os.path.abspath(base_dir)):
-                abort(403)
-            if os.path.isdir(abs_path):
-                for root_dir, _, files in os.walk(abs_path):
-                    for fname in files:
-                        abs_file = os.path.join(root_dir, fname)
-                        arcname = os.path.relpath(abs_file, base_dir)
-                        zipf.write(abs_file, arcname)
-            elif os.path.isfile(abs_path):
-                zipf.write(abs_path, rel_path)
-
-    memory_file.seek(0)
-    return send_file(
-        memory_file,
-        download_name="selected_files.zip",
+    # Every path is checked before the response starts, while it can still be refused
+    targets = []
+    for rel_path in paths:
+        abs_path = resolve_path(base_dir, rel_path)
+        if abs_path is None:
+            abort(403)
+        targets.append((abs_path, rel_path))
+
+    # A single file is sent as it is; the client names the download from Content-Disposition
+    if len(targets) == 1 and os.path.isfile(targets[0][0]):
+        return send_file(targets[0][0], as_attachment=True)
+
+    def generate():
+        buffer = ZipStreamBuffer()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zipf:
+            for abs_path, rel_path in targets:
+                if os.path.isdir(abs_path):
+                    for root_dir, _, files in os.walk(abs_path):
+                        for fname in files:
+                            abs_file = os.path.join(root_dir, fname)
+                            yield from write_zip_entry(zipf, buffer, abs_file, os.path.relpath(abs_file, base_dir))
+                elif os.path.isfile(abs_path):
+                    yield from write_zip_entry(zipf, buffer, abs_path, rel_path)
+        # Closing the archive writes its central directory
+        yield buffer.drain()
+
+    return Response(
+        generate(),
         mimetype="application/zip",
-        as_attachment=True,
+        headers={"Content-Disposition": "attachment; filename=selected_files.zip"}
     )
 
 @app.route('/download-plugin-file')
@@ -444,8 +562,8 @@ def plugin_page(plugin_id):
     # Security check - ensure we stay within base directory
     base_dir = app.config.get('BASE_DIR')
     if current_path:
-        abs_path = os.path.abspath(os.path.join(base_dir, current_path))
-        if not abs_path.startswith(os.path.abspath(base_dir)):
+        abs_path = resolve_path(base_dir, current_path)
+        if abs_path is None:
             abort(403)
     else:
         abs_path = base_dir
@@ -476,16 +594,13 @@ def _generate_plugin_breadcrumbs(manifest, target_path):
     ]
     
     if target_path:
-        # Add path segments
-        segments = target_path.split('/')
-        accumulated = ''
-        for segment in segments:
-            if segment:
-                accumulated += segment + '/'
-                breadcrumbs.append({
-                    'name': segment,
-                    'url': url_for('explore', path=accumulated.rstrip('/'))
-                })
+        # Add path segments, each linking to the path up to and including it
+        segments = [segment for segment in target_path.split('/') if segment]
+        for segment, accumulated in zip(segments, accumulate(segments, lambda a, b: a + '/' + b)):
+            breadcrumbs.append({
+                'name': segment,
+                'url': url_for('explore', path=accumulated)
+            })
     
     # Add plugin breadcrumb
     plugin_title = manifest.get('page_title') or manifest.get('name')
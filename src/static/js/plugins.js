@@ -66,6 +66,22 @@ window.showToast = function(message, type = 'success', duration = 3000) {
 };
 
 
+/**
+ * Returns the file name a download response was sent with.
+ * @param {Response} response - The fetch response.
+ * @param {string} fallback - Name to use when the response has no Content-Disposition file name.
+ * @returns {string}
+ */
+window.downloadFilename = function(response, fallback) {
+    const disposition = response.headers.get('Content-Disposition') || '';
+    const encoded = disposition.match(/filename\*=UTF-8''([^;]+)/i);
+    if (encoded) {
+        return decodeURIComponent(encoded[1]);
+    }
+    const plain = disposition.match(/filename="?([^";]+)"?/i);
+    return plain ? plain[1] : fallback;
+};
+
 /**
  * Copies text to the clipboard.
  * @param {string} text - The text to copy.
@@ -430,13 +446,15 @@ document.addEventListener('DOMContentLoaded', function() {
                 if (!resp.ok) { //
                     return resp.json().then(err => { throw new Error(err.error || 'Download failed: ' + resp.statusText); });
                 }
-                return resp.blob(); //
+                // A single selected file comes back as is, other selections as a ZIP
+                const filename = window.downloadFilename(resp, 'selected_files.zip');
+                return resp.blob().then(blob => ({ blob, filename }));
             })
-            .then(blob => {
+            .then(({ blob, filename }) => {
                 const url = window.URL.createObjectURL(blob);
                 const a = document.createElement('a');
                 a.href = url;
-                a.download = 'selected_files.zip'; //
+                a.download = filename;
                 document.body.appendChild(a);
                 a.click();
                 a.remove();
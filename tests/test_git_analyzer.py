@@ -0,0 +1,127 @@
+"""
+Tests for the git plumbing helpers of the Git Repository Analyzer plugin.
+"""
+import os
+import shutil
+import subprocess
+import pytest
+
+from src.plugins.git_repo_analyzer import git_analyzer
+
+pytestmark = pytest.mark.skipif(shutil.which('git') is None, reason="git is not installed")
+
+def git(cwd, *args):
+    """Run a git command in cwd and return its stripped stdout as bytes."""
+    env = dict(
+        os.environ,
+        GIT_AUTHOR_NAME='Test', GIT_AUTHOR_EMAIL='test@example.com',
+        GIT_COMMITTER_NAME='Test', GIT_COMMITTER_EMAIL='test@example.com',
+        GIT_CONFIG_NOSYSTEM='1', HOME=str(cwd)
+    )
+    return subprocess.run(
+        ['git'] + list(args), cwd=cwd, env=env, check=True, capture_output=True
+    ).stdout.strip()
+
+@pytest.fixture
+def repo(tmp_path):
+    """Create a repository with a single commit on branch main."""
+    path = tmp_path / 'repo'
+    path.mkdir()
+    git(path, 'init', '-q', '-b', 'main')
+    (path / 'README.md').write_text('Test content')
+    git(path, 'add', 'README.md')
+    git(path, 'commit', '-q', '-m', 'Initial commit')
+    return path
+
+def test_find_git_dir(repo):
+    """Test that a normal repository resolves to its .git directory."""
+    git_dir = git_analyzer.find_git_dir(str(repo))
+    assert git_dir == os.path.join(str(repo), '.git')
+    assert git_analyzer.get_common_dir(git_dir) == git_dir
+
+def test_find_git_dir_not_a_repository(tmp_path):
+    """Test that a plain directory is not reported as a repository."""
+    assert git_analyzer.find_git_dir(str(tmp_path)) is None
+
+def test_read_head_sha(repo):
+    """Test that HEAD resolves through a loose branch ref."""
+    git_dir = git_analyzer.find_git_dir(str(repo))
+    assert git_analyzer.read_head_ref(git_dir) == b'ref: refs/heads/main'
+    assert git_analyzer.read_head_sha(git_dir) == git(repo, 'rev-parse', 'HEAD')
+
+def test_read_head_sha_packed_refs(repo):
+    """Test that HEAD resolves once git gc has moved the branch into packed-refs."""
+    git(repo, 'gc', '-q')
+    git_dir = git_analyzer.find_git_dir(str(repo))
+    assert not os.path.exists(os.path.join(git_dir, 'refs', 'heads', 'main'))
+    assert git_analyzer.read_head_sha(git_dir) == git(repo, 'rev-parse', 'HEAD')
+
+def test_read_head_sha_detached(repo):
+    """Test that a detached HEAD returns the SHA it holds."""
+    sha = git(repo, 'rev-parse', 'HEAD')
+    git(repo, 'checkout', '-q', '--detach')
+    git_dir = git_analyzer.find_git_dir(str(repo))
+    assert git_analyzer.read_head_ref(git_dir) == sha
+    assert git_analyzer.read_head_sha(git_dir) == sha
+
+def test_read_head_sha_unborn(tmp_path):
+    """Test that a repository without commits has no HEAD SHA."""
+    git(tmp_path, 'init', '-q')
+    git_dir = git_analyzer.find_git_dir(str(tmp_path))
+    assert git_analyzer.read_head_sha(git_dir) is None
+
+def test_linked_worktree(repo, tmp_path):
+    """Test that a linked worktree follows its .git file to the shared refs."""
+    worktree = tmp_path / 'worktree'
+    git(repo, 'worktree', 'add', '-q', '-b', 'feature', str(worktree))
+    git(repo, 'pack-refs', '--all')
+    
+    git_dir = git_analyzer.find_git_dir(str(worktree))
+    assert os.path.isfile(worktree / '.git')
+    assert git_dir == os.path.join(str(repo), '.git', 'worktrees', 'worktree')
+    assert git_analyzer.get_common_dir(git_dir) == os.path.join(str(repo), '.git')
+    assert git_analyzer.read_head_sha(git_dir) == git(worktree, 'rev-parse', 'HEAD')
+
+def test_tree_stats_extensions(repo):
+    """Test that extensions follow os.path.splitext rules and submodules have no size."""
+    for name in ('.bashrc', 'a.tar.gz', 'Makefile', 'dir.x/file'):
+        file_path = repo / name
+        file_path.parent.mkdir(exist_ok=True)
+        file_path.write_text('x')
+    git(repo, 'add', '.')
+    # A gitlink entry, as a submodule records it, listed with size "-"
+    head = git(repo, 'rev-parse', 'HEAD').decode('ascii')
+    git(repo, 'update-index', '--add', '--cacheinfo', f'160000,{head},sub')
+    git(repo, 'commit', '-q', '-m', 'Add files')
+    
+    tree_sha = git(repo, 'rev-parse', 'HEAD^{tree}')
+    total_size, extensions, total_files = git_analyzer._tree_stats(str(repo), tree_sha)
+    assert total_files == 6
+    assert total_size == len('Test content') + 4
+    assert extensions == {b'md': 1, b'gz': 1, None: 4}
+
+def test_report_cache_follows_refs(repo):
+    """Test that a new branch or remote invalidates the cached report."""
+    first = git_analyzer.execute(str(repo))['output']
+    assert 'feature-xyz' not in first
+    
+    git(repo, 'branch', 'feature-xyz')
+    second = git_analyzer.execute(str(repo))['output']
+    assert 'feature-xyz' in second
+    
+    git(repo, 'remote', 'add', 'origin', 'https://example.com/repo.git')
+    third = git_analyzer.execute(str(repo))['output']
+    assert 'https://example.com/repo.git' in third
+
+def test_ensure_commit_graph(repo, monkeypatch):
+    """Test that the commit-graph is written in the background, once."""
+    monkeypatch.setattr(git_analyzer, 'COMMIT_GRAPH_MIN_PACK_SIZE', 0)
+    # A pack without a commit-graph (git gc would write one itself)
+    git(repo, 'repack', '-adq')
+    git_dir = git_analyzer.find_git_dir(str(repo))
+    
+    thread = git_analyzer.ensure_commit_graph(str(repo), git_dir)
+    assert thread is not None
+    thread.join(timeout=60)
+    assert os.path.exists(os.path.join(git_dir, 'objects', 'info', 'commit-graph'))
+    assert git_analyzer.ensure_commit_graph(str(repo), git_dir) is None
@@ -0,0 +1,61 @@
+"""
+Tests for the native directory walker of the Tree View plugin.
+"""
+import os
+import pytest
+
+from src.plugins.tree_view import tree_plugin
+
+def test_tree_output(tmp_path):
+    """Test the tree layout, hidden files, symlinks and the summary line."""
+    (tmp_path / 'a' / 'b').mkdir(parents=True)
+    (tmp_path / 'a' / 'b' / 'f.txt').write_text('x')
+    (tmp_path / 'z.py').write_text('x')
+    (tmp_path / '.hidden').write_text('x')
+    os.symlink('a/b', tmp_path / 'link')
+    
+    result = tree_plugin.execute(str(tmp_path))
+    assert result['success']
+    assert result['output'] == '\n'.join([
+        str(tmp_path),
+        '├── a',
+        '│   └── b',
+        '│       └── f.txt',
+        '├── link -> a/b',
+        '└── z.py',
+        '',
+        '3 directories, 2 files',
+        ''
+    ])
+
+@pytest.mark.skipif(tree_plugin.pathspec is None, reason="pathspec is not installed")
+def test_tree_gitignore(tmp_path):
+    """Test that nested .gitignore files apply relative to their own directory."""
+    (tmp_path / 'build').mkdir()
+    (tmp_path / 'build' / 'out').write_text('x')
+    (tmp_path / 'src').mkdir()
+    for name in ('keep.log', 'drop.log', 'main.py'):
+        (tmp_path / 'src' / name).write_text('x')
+    (tmp_path / '.gitignore').write_text('build/\n')
+    (tmp_path / 'src' / '.gitignore').write_text('*.log\n!keep.log\n')
+    
+    lines = tree_plugin.execute(str(tmp_path))['output'].splitlines()
+    assert lines[1:] == ['└── src', '    ├── keep.log', '    └── main.py', '', '1 directory, 2 files']
+
+def test_tree_missing_directory(tmp_path):
+    """Test that a missing directory is reported as an error."""
+    result = tree_plugin.execute(str(tmp_path / 'missing'))
+    assert not result['success']
+
+@pytest.mark.skipif(tree_plugin.pathspec is None, reason="pathspec is not installed")
+def test_gitignore_cache(tmp_path):
+    """Test that a compiled .gitignore is reused until the file changes."""
+    gitignore = tmp_path / '.gitignore'
+    gitignore.write_text('*.log\n')
+    spec = tree_plugin.load_gitignore(str(tmp_path))
+    assert tree_plugin.load_gitignore(str(tmp_path)) is spec
+    
+    gitignore.write_text('*.log\n*.tmp\n')
+    assert tree_plugin.load_gitignore(str(tmp_path)) is not spec
+    gitignore.unlink()
+    assert tree_plugin.load_gitignore(str(tmp_path)) is None